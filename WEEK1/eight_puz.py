@@ -1,4 +1,6 @@
-
+import math
+import mmap
+import os
 from collections import deque
 
 def swap(state,pos1,pos2):
@@ -39,19 +41,21 @@ def states_moves(state,parent):
     moves.reverse()
     return states,moves[1:]
 
-def bfs_puzzle(initial_state,goal_state):
+def bfs_puzzle(initial_state,goal_state,table=None):
+     if table is not None:
+         return table.query(initial_state,goal_state)
      queue = deque([initial_state])
-     visited = set()
+     visited = {initial_state}
      parent = {initial_state:(None,None)}
      
      while queue:
          curr_state = queue.popleft()
-         visited.add(curr_state)
          if curr_state == goal_state :
              return states_moves(goal_state,parent)
          
          for next_state,move in next_states(curr_state):
              if next_state not in visited:
+                 visited.add(next_state)
                  queue.append(next_state)
                  parent[next_state] = (curr_state,move)
     
@@ -74,29 +78,263 @@ def dfs_puzzle(initial_state,goal_state):
                 stack.append(next_state)
                 parent[next_state] = (curr_state,move)
     return None           
- 
-initial_state = (1,2,3,4,0,5,6,7,8)
-goal_state = (1,2,3,4,5,6,7,8,0)
 
-print("____DFS SOLUTION____")    
-if dfs_puzzle(initial_state,goal_state) is not None:
-    states, moves = dfs_puzzle(initial_state,goal_state)
-    print(f'Initial State: {states[0]}')
-    for i in range(len(moves)):
-        print(f'Move: {moves[i]}')
-        print(f'State: {states[i+1]}')
-    print(f'Total Moves = {len(moves)}')
-else:
-    print("No solution")
-    
+# Packed states: tile at index i lives in bits 4*i .. 4*i+3 of one integer
+MOVE_NAMES = ("UP", "DOWN", "LEFT", "RIGHT")
+
+def blank_moves(width=3):
+    table = []
+    for idx in range(width * width):
+        row, col = idx // width, idx % width
+        options = []
+        if row > 0:
+            options.append((idx - width, 0))
+        if row < width - 1:
+            options.append((idx + width, 1))
+        if col > 0:
+            options.append((idx - 1, 2))
+        if col < width - 1:
+            options.append((idx + 1, 3))
+        table.append(tuple(options))
+    return tuple(table)
+
+BLANK_MOVES = blank_moves()
+
+def pack(state):
+    code = 0
+    for i, val in enumerate(state):
+        code |= val << (4 * i)
+    return code
+
+def unpack(code, size=9):
+    return tuple((code >> (4 * i)) & 0xF for i in range(size))
 
-print("____BFS SOLUTION____")
-if bfs_puzzle(initial_state,goal_state) is not None:
-    states, moves = bfs_puzzle(initial_state,goal_state)
+def slide(code, blank, pos):
+    # move the tile at pos into the blank, returns the new packed board
+    tile = (code >> (4 * pos)) & 0xF
+    return code - (tile << (4 * pos)) + (tile << (4 * blank))
+
+# parent[code] = (previous code << 2) | move index, -1 for the start
+def packed_states_moves(code, parent, size=9):
+    states = []
+    moves = []
+    while True:
+        states.append(unpack(code, size))
+        link = parent[code]
+        if link < 0:
+            break
+        moves.append(MOVE_NAMES[link & 3])
+        code = link >> 2
+    states.reverse()
+    moves.reverse()
+    return states, moves
+
+# queue entries carry the blank position in the low 4 bits: (code << 4) | blank
+def bfs_puzzle_packed(initial_state, goal_state):
+    start, goal = pack(initial_state), pack(goal_state)
+    queue = deque([start << 4 | initial_state.index(0)])
+    parent = {start: -1}
+
+    while queue:
+        entry = queue.popleft()
+        code, blank = entry >> 4, entry & 0xF
+        if code == goal:
+            return packed_states_moves(code, parent, len(initial_state))
+
+        for pos, move in BLANK_MOVES[blank]:
+            nxt = slide(code, blank, pos)
+            if nxt not in parent:
+                parent[nxt] = code << 2 | move
+                queue.append(nxt << 4 | pos)
+    return None
+
+def dfs_puzzle_packed(initial_state, goal_state):
+    start, goal = pack(initial_state), pack(goal_state)
+    stack = [start << 4 | initial_state.index(0)]
+    parent = {start: -1}
+
+    while stack:
+        entry = stack.pop()
+        code, blank = entry >> 4, entry & 0xF
+        if code == goal:
+            return packed_states_moves(code, parent, len(initial_state))
+
+        for pos, move in BLANK_MOVES[blank]:
+            nxt = slide(code, blank, pos)
+            if nxt not in parent:
+                parent[nxt] = code << 2 | move
+                stack.append(nxt << 4 | pos)
+    return None
+
+def is_solvable(state):
+    arr = [x for x in state if x != 0]
+    inversions = 0
+    for i in range(len(arr)):
+        for j in range(i+1, len(arr)):
+            if arr[i] > arr[j]:
+                inversions += 1
+    width = math.isqrt(len(state))
+    if width % 2 == 0:
+        # even widths: the blank's row (counted from the bottom) flips the parity
+        return (inversions + width - state.index(0) // width) % 2 == 1
+    return inversions % 2 == 0
+
+def packed_depth(parent, code):
+    depth = 0
+    link = parent[code]
+    while link >= 0:
+        depth += 1
+        link = parent[link >> 2]
+    return depth
+
+# forward chain start -> meet, then the backward chain meet -> goal with its moves reversed
+def splice_paths(meet, forward_parent, backward_parent, size=9):
+    states, moves = packed_states_moves(meet, forward_parent, size)
+    link = backward_parent[meet]
+    while link >= 0:
+        states.append(unpack(link >> 2, size))
+        moves.append(MOVE_NAMES[(link & 3) ^ 1])  # UP<->DOWN, LEFT<->RIGHT
+        link = backward_parent[link >> 2]
+    return states, moves
+
+# Expands one whole BFS level at a time, always on the side with the smaller frontier
+def bidirectional_bfs(initial_state, goal_state):
+    if is_solvable(initial_state) != is_solvable(goal_state):
+        return None
+    start, goal = pack(initial_state), pack(goal_state)
+    if start == goal:
+        return [initial_state], []
+
+    parents = ({start: -1}, {goal: -1})
+    frontiers = [[start << 4 | initial_state.index(0)], [goal << 4 | goal_state.index(0)]]
+
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        parent, other = parents[side], parents[1 - side]
+        next_frontier = []
+        meets = []
+        for entry in frontiers[side]:
+            code, blank = entry >> 4, entry & 0xF
+            for pos, move in BLANK_MOVES[blank]:
+                nxt = slide(code, blank, pos)
+                if nxt in parent:
+                    continue
+                parent[nxt] = code << 2 | move
+                if nxt in other:
+                    meets.append(nxt)
+                next_frontier.append(nxt << 4 | pos)
+
+        if meets:
+            # every meet is at the same depth on this side, pick the shallowest on the other
+            meet = min(meets, key=lambda c: packed_depth(other, c))
+            return splice_paths(meet, parents[0], parents[1], len(initial_state))
+        frontiers[side] = next_frontier
+    return None
+
+# Perfect distance table: one byte per permutation of the board, indexed by its
+# Lehmer rank, holding the optimal number of moves to the goal (255 = unreachable)
+TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+FACTORIALS = tuple(math.factorial(i) for i in range(9))
+UNREACHED = 255
+
+def packed_rank(code, size=9):
+    rank = 0
+    used = 0
+    for i in range(size):
+        val = (code >> (4 * i)) & 0xF
+        rank += (val - (used & ((1 << val) - 1)).bit_count()) * FACTORIALS[size - 1 - i]
+        used |= 1 << val
+    return rank
+
+def perm_rank(state):
+    return packed_rank(pack(state), len(state))
+
+# Retrograde BFS from the goal over the packed states
+def build_distance_table(goal_state):
+    table = bytearray([UNREACHED]) * math.factorial(len(goal_state))
+    table[perm_rank(goal_state)] = 0
+    frontier = [pack(goal_state) << 4 | goal_state.index(0)]
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for entry in frontier:
+            code, blank = entry >> 4, entry & 0xF
+            for pos, _ in BLANK_MOVES[blank]:
+                nxt = slide(code, blank, pos)
+                idx = packed_rank(nxt)
+                if table[idx] == UNREACHED:
+                    table[idx] = depth
+                    next_frontier.append(nxt << 4 | pos)
+        frontier = next_frontier
+    return table
+
+class DistanceTable:
+    def __init__(self, goal_state, data):
+        self.goal = tuple(goal_state)
+        self.data = data
+
+    def distance(self, state):
+        if len(state) != len(self.goal):
+            raise ValueError("Distance table was built for a %d-cell board" % len(self.goal))
+        d = self.data[perm_rank(state)]
+        return None if d == UNREACHED else d
+
+    # greedy walk: some neighbour is always exactly one move closer to the goal
+    def solve(self, state):
+        d = self.distance(state)
+        if d is None:
+            return None
+        code, blank = pack(state), state.index(0)
+        states = [tuple(state)]
+        moves = []
+        while d > 0:
+            for pos, move in BLANK_MOVES[blank]:
+                nxt = slide(code, blank, pos)
+                if self.data[packed_rank(nxt)] == d - 1:
+                    break
+            code, blank = nxt, pos
+            states.append(unpack(code))
+            moves.append(MOVE_NAMES[move])
+            d -= 1
+        return states, moves
+
+    def query(self, initial_state, goal_state):
+        if tuple(goal_state) != self.goal:
+            raise ValueError("Distance table was built for a different goal state")
+        return self.solve(initial_state)
+
+def load_distance_table(goal_state, directory=TABLE_DIR):
+    if len(goal_state) != 9:
+        raise ValueError("Perfect distance tables are only built for the 8-puzzle")
+    path = os.path.join(directory, "dist_%s.bin" % "".join(map(str, goal_state)))
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(build_distance_table(goal_state))
+        os.replace(tmp, path)
+    with open(path, "rb") as f:
+        return DistanceTable(goal_state, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+def print_solution(title, result):
+    print(f"____{title} SOLUTION____")
+    if result is None:
+        print("No solution")
+        return
+    states, moves = result
     print(f'Initial State: {states[0]}')
     for i in range(len(moves)):
         print(f'Move: {moves[i]}')
         print(f'State: {states[i+1]}')
     print(f'Total Moves = {len(moves)}')
-else:
-    print("No solution")
+
+
+if __name__ == "__main__":
+    initial_state = (1,2,3,4,0,5,6,7,8)
+    goal_state = (1,2,3,4,5,6,7,8,0)
+
+    print_solution("DFS", dfs_puzzle(initial_state,goal_state))
+    print_solution("BFS", bfs_puzzle(initial_state,goal_state))
+    print_solution("BIDIRECTIONAL BFS", bidirectional_bfs(initial_state,goal_state))
+    print_solution("DISTANCE TABLE", bfs_puzzle(initial_state,goal_state,load_distance_table(goal_state)))
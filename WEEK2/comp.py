@@ -1,5 +1,8 @@
 import time, random, heapq
-from collections import deque
+import multiprocessing as mp
+from collections import OrderedDict, deque
+from multiprocessing import shared_memory
+import numpy as np
 import pandas as pd
 
 
@@ -32,7 +35,111 @@ def generate_weighted_graph(n, extra_edges_factor=2, weight_range=(1, 10)):
         added += 1
     return adj
 
+# Compressed sparse row graph: the neighbours of u are indices[indptr[u]:indptr[u+1]]
+# (sorted) with matching weights. The searches below walk u -> [(v, w), ...] lists
+# (neighbour_lists()): a dict of lists is used as it is, and a CSRGraph builds its
+# lists once on first use, as numpy scalar access is slow from Python.
+class CSRGraph:
+    def __init__(self, indptr, indices, weights):
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.n = len(indptr) - 1
+        self._adjacency = None
+        self.landmarks = {}  # num_landmarks -> distance tables, filled by build_landmarks
+
+    @classmethod
+    def from_edges(cls, n, us, vs, ws):
+        src = np.concatenate([us, vs])
+        dst = np.concatenate([vs, us])
+        w = np.concatenate([ws, ws])
+        order = np.lexsort((dst, src))
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+        return cls(indptr, dst[order].astype(np.int64), w[order].astype(np.int64))
+
+    @classmethod
+    def from_adj(cls, adj):
+        us, vs, ws = [], [], []
+        for u in range(len(adj)):
+            for v, w in adj[u]:
+                if u < v:
+                    us.append(u)
+                    vs.append(v)
+                    ws.append(w)
+        return cls.from_edges(len(adj), np.array(us, dtype=np.int64),
+                              np.array(vs, dtype=np.int64), np.array(ws, dtype=np.int64))
+
+    def __len__(self):
+        return self.n
+
+    # (v, w) pairs of u, like adj[u] of a dict of lists
+    def __getitem__(self, u):
+        return self.adjacency()[u]
+
+    def adjacency(self):
+        if self._adjacency is None:
+            indptr, indices, weights = self.indptr.tolist(), self.indices.tolist(), self.weights.tolist()
+            self._adjacency = [list(zip(indices[a:b], weights[a:b])) for a, b in zip(indptr, indptr[1:])]
+        return self._adjacency
+
+    def edge_weight(self, u, v):
+        a, b = self.indptr[u], self.indptr[u + 1]
+        i = a + np.searchsorted(self.indices[a:b], v)
+        if i < b and self.indices[i] == v:
+            return int(self.weights[i])
+        return None
+
+    # all neighbours of an array of nodes, concatenated
+    def neighbours_of(self, nodes):
+        starts = self.indptr[nodes]
+        lens = self.indptr[nodes + 1] - starts
+        offsets = np.repeat(starts - (np.cumsum(lens) - lens), lens)
+        return self.indices[offsets + np.arange(lens.sum())]
+
+def as_csr(adj):
+    return adj if isinstance(adj, CSRGraph) else CSRGraph.from_adj(adj)
+
+def neighbour_lists(adj):
+    return adj.adjacency() if isinstance(adj, CSRGraph) else adj
+
+# Same graph family as generate_weighted_graph (random tree + extra random edges), vectorized
+def generate_csr_graph(n, extra_edges_factor=2, weight_range=(1, 10), seed=None):
+    if n < 2:
+        raise ValueError("A graph needs at least 2 nodes, got %d" % n)
+    room = n * (n - 1) // 2 - (n - 1)
+    if extra_edges_factor * n > room:
+        raise ValueError("%d nodes leave room for only %d extra edges, not %d"
+                         % (n, room, extra_edges_factor * n))
+    rng = np.random.default_rng(seed)
+    child = np.arange(1, n, dtype=np.int64)
+    parent = (rng.random(n - 1) * child).astype(np.int64)
+    keys = parent * n + child
+
+    need = extra_edges_factor * n
+    while need > 0:
+        a = rng.integers(0, n, size=need + need // 10 + 16)
+        b = rng.integers(0, n, size=a.size)
+        a, b = a[a != b], b[a != b]
+        cand = np.unique(np.minimum(a, b) * n + np.maximum(a, b))
+        cand = cand[~np.isin(cand, keys)]
+        cand = rng.permutation(cand)[:need]
+        keys = np.concatenate([keys, cand])
+        need -= cand.size
+
+    weights = rng.integers(weight_range[0], weight_range[1] + 1, size=keys.size)
+    return CSRGraph.from_edges(n, keys // n, keys % n, weights)
+
 def is_connected(adj):
+    if isinstance(adj, CSRGraph):
+        seen = np.zeros(adj.n, dtype=bool)
+        seen[0] = True
+        frontier = np.array([0], dtype=np.int64)
+        while frontier.size:
+            nbrs = adj.neighbours_of(frontier)
+            frontier = np.unique(nbrs[~seen[nbrs]])
+            seen[frontier] = True
+        return bool(seen.all())
     visited = set()
     q = deque([0])
     visited.add(0)
@@ -61,14 +168,18 @@ def path_cost(adj, path):
     cost = 0
     for i in range(len(path)-1):
         u, v = path[i], path[i+1]
-        for nei, w in adj[u]:
-            if nei == v:
-                cost += w
-                break
+        if isinstance(adj, CSRGraph):
+            w = adj.edge_weight(u, v)
+        else:
+            w = next((w for nei, w in adj[u] if nei == v), None)
+        if w is None:
+            raise ValueError("Path uses %r -> %r, which is not an edge of the graph" % (u, v))
+        cost += w
     return cost
 
 # BFS
 def bfs(adj, start, goal):
+    nbrs = neighbour_lists(adj)
     start_time = time.perf_counter()
     q = deque([start])
     visited = {start}
@@ -81,7 +192,7 @@ def bfs(adj, start, goal):
         if u == goal:
             found = True
             break
-        for v, _ in adj[u]:
+        for v, _ in nbrs[u]:
             if v not in visited:
                 visited.add(v)
                 parents[v] = u
@@ -94,6 +205,7 @@ def bfs(adj, start, goal):
 
 #DFS
 def dfs(adj, start, goal):
+    nbrs = neighbour_lists(adj)
     start_time = time.perf_counter()
     stack = [start]
     parents = {}
@@ -106,7 +218,7 @@ def dfs(adj, start, goal):
         if u == goal:
             found = True
             break
-        for v, _ in adj[u]:
+        for v, _ in nbrs[u]:
             if v not in visited:
                 visited.add(v)
                 parents[v] = u
@@ -119,6 +231,7 @@ def dfs(adj, start, goal):
 
 #UCS
 def ucs(adj, start, goal):
+    nbrs = neighbour_lists(adj)
     start_time = time.perf_counter()
     dist = {start: 0}
     parents = {}
@@ -133,7 +246,7 @@ def ucs(adj, start, goal):
         nodes_expanded += 1
         if u == goal:
             break
-        for v, w in adj[u]:
+        for v, w in nbrs[u]:
             new_cost = cost + w
             if v not in dist or new_cost < dist[v]:
                 dist[v] = new_cost
@@ -147,77 +260,407 @@ def ucs(adj, start, goal):
     }
 
 #IDS
-def depth_limited_dfs(adj, node, goal, limit, visited_path, parents, counter):
+# One depth-limited pass with an explicit stack over neighbour lists. buffers = (path,
+# cursor, on_path, depth_seen): per-depth node and next index into its neighbour list,
+# the set of nodes on the current path, and the shallowest depth nodes were reached at
+# in this pass. All are reused by every pass.
+# The on-path set alone rules out cycles in O(depth) memory. depth_seen additionally
+# skips a node reached again by a route no shorter than an earlier one, which stops
+# IDS re-expanding the same subtrees through every alternative route. It is a
+# transposition table, so it holds at most table_size entries: once full, new nodes
+# are not recorded and are only checked against the path. table_size=0 gives the
+# classic O(depth)-memory IDS, which re-expands heavily on graphs with many routes.
+# Returns (goal depth or None, whether any node was touched at the depth limit).
+def depth_limited_dfs(nbrs, start, goal, limit, buffers, counter, table_size):
+    path, cursor, on_path, depth_seen = buffers
+    on_path.clear()
+    on_path.add(start)
+    depth_seen.clear()
+    if table_size:
+        depth_seen[start] = 0
+    path[0], cursor[0] = start, 0
     counter['expanded'] += 1
-    if node == goal: return True
-    if limit == 0: return False
-    for v, _ in adj[node]:
-        if v in visited_path:
+    if start == goal: return 0, False
+    if limit == 0: return None, True
+    cutoff = False
+    depth = 0
+    while depth >= 0:
+        k = cursor[depth]
+        edges = nbrs[path[depth]]
+        if k == len(edges):
+            on_path.discard(path[depth])
+            depth -= 1
+            continue
+        cursor[depth] = k + 1
+        v = edges[k][0]
+        d = depth + 1
+        if v in on_path:
             continue
-        parents[v] = node
-        visited_path.add(v)
-        if depth_limited_dfs(adj, v, goal, limit-1, visited_path, parents, counter):
-            return True
-        visited_path.remove(v)
-    return False
-
-def ids(adj, start, goal, max_depth=None):
+        seen = depth_seen.get(v)
+        if seen is not None:
+            if seen <= d:
+                continue
+            depth_seen[v] = d
+        elif len(depth_seen) < table_size:
+            depth_seen[v] = d
+        counter['expanded'] += 1
+        if d == len(path):
+            path.append(v)
+            cursor.append(0)
+        else:
+            path[d] = v
+        if v == goal:
+            return d, cutoff
+        if d == limit:
+            cutoff = True
+            continue
+        on_path.add(v)
+        cursor[d] = 0
+        depth = d
+    return None, cutoff
+
+def ids(adj, start, goal, max_depth=None, table_size=1 << 16):
+    nbrs = neighbour_lists(adj)
     start_time = time.perf_counter()
     if max_depth is None: max_depth = len(adj)
-    total_expanded = 0
-    parents_final = None
-    found = False
+    buffers = ([start], [0], set(), {})
+    counter = {'expanded': 0}
+    path = None
     for depth in range(max_depth + 1):
-        parents = {}
-        counter = {'expanded': 0}
-        visited_path = {start}
-        if depth_limited_dfs(adj, start, goal, depth, visited_path, parents, counter):
-            parents_final = parents
-            found = True
-            total_expanded += counter['expanded']
+        found, cutoff = depth_limited_dfs(nbrs, start, goal, depth, buffers, counter, table_size)
+        if found is not None:
+            path = buffers[0][:found + 1]
             break
-        total_expanded += counter['expanded']
+        if not cutoff:
+            break  # no node reached the limit, deeper passes cannot find anything new
     return {
-        "path": reconstruct_path(parents_final, start, goal) if found else None,
-        "nodes": total_expanded,
+        "path": path,
+        "nodes": counter['expanded'],
         "time": time.perf_counter() - start_time
     }
 
+#ALT (A*, Landmarks, Triangle inequality)
+INF = float('inf')
+
+def dijkstra_all(adj, source):
+    nbrs = neighbour_lists(adj)
+    dist = [INF] * len(adj)
+    dist[source] = 0
+    pq = [(0, source)]
+    while pq:
+        cost, u = heapq.heappop(pq)
+        if cost > dist[u]:
+            continue
+        for v, w in nbrs[u]:
+            new_cost = cost + w
+            if new_cost < dist[v]:
+                dist[v] = new_cost
+                heapq.heappush(pq, (new_cost, v))
+    return dist
+
+# Landmarks are picked farthest-first. The distance tables are kept on the CSRGraph, so
+# they are built once and live exactly as long as the graph. A dict of lists has nowhere
+# to keep them, so it is refused rather than paying the Dijkstras again on every query.
+def build_landmarks(graph, num_landmarks=8):
+    if not isinstance(graph, CSRGraph):
+        raise TypeError("Landmark tables are stored on a CSRGraph; convert the graph once "
+                        "with CSRGraph.from_adj, or pass num_landmarks=0")
+    cached = graph.landmarks.get(num_landmarks)
+    if cached is not None:
+        return cached
+    n = len(graph)
+    tables = []
+    closest = [INF] * n
+    landmark = 0
+    for _ in range(min(num_landmarks, n)):
+        dist = dijkstra_all(graph, landmark)
+        tables.append(dist)
+        closest = [min(a, b) if b != INF else a for a, b in zip(closest, dist)]
+        landmark = max(range(n), key=lambda v: closest[v] if closest[v] != INF else -1)
+    graph.landmarks[num_landmarks] = tables
+    return tables
+
+# Lower bound on d(v, target): max over landmarks L of |d(L, target) - d(L, v)|
+def alt_heuristic(tables, target):
+    target_dists = [(dist, dist[target]) for dist in tables if dist[target] != INF]
+    memo = {}
+    def h(v):
+        best = memo.get(v)
+        if best is None:
+            best = 0
+            for dist, dt in target_dists:
+                diff = abs(dt - dist[v])
+                if diff > best:
+                    best = diff
+            memo[v] = best
+        return best
+    return h
+
+#A*
+# The ALT heuristic needs a CSRGraph (see build_landmarks); num_landmarks=0 runs plain
+# UCS order on any graph.
+def astar(adj, start, goal, num_landmarks=8):
+    tables = build_landmarks(adj, num_landmarks) if num_landmarks else []
+    nbrs = neighbour_lists(adj)
+    start_time = time.perf_counter()
+    h = alt_heuristic(tables, goal)
+    dist = {start: 0}
+    parents = {}
+    pq = [(h(start), start)]
+    visited = set()
+    nodes_expanded = 0
+    while pq:
+        _, u = heapq.heappop(pq)
+        if u in visited:
+            continue
+        visited.add(u)
+        nodes_expanded += 1
+        if u == goal:
+            break
+        cost = dist[u]
+        for v, w in nbrs[u]:
+            new_cost = cost + w
+            if v not in dist or new_cost < dist[v]:
+                dist[v] = new_cost
+                parents[v] = u
+                heapq.heappush(pq, (new_cost + h(v), v))
+    return {
+        "path": reconstruct_path(parents, start, goal) if goal in dist else None,
+        "nodes": nodes_expanded,
+        "time": time.perf_counter() - start_time,
+        "cost": dist.get(goal, None)
+    }
+
+#Bidirectional UCS
+# Both searches use the average potential p(v) = (h_goal(v) - h_start(v)) / 2 (forward)
+# and -p(v) (backward), which keeps the two searches consistent with each other;
+# num_landmarks=0 gives plain bidirectional Dijkstra, which also accepts a dict of lists.
+def bidirectional_ucs(adj, start, goal, num_landmarks=8):
+    tables = build_landmarks(adj, num_landmarks) if num_landmarks else []
+    nbrs = neighbour_lists(adj)
+    start_time = time.perf_counter()
+    h_goal = alt_heuristic(tables, goal)
+    h_start = alt_heuristic(tables, start)
+    potential = lambda v: (h_goal(v) - h_start(v)) / 2
+    signs = (1, -1)
+
+    dists = ({start: 0}, {goal: 0})
+    parents = ({}, {})
+    visited = (set(), set())
+    heaps = ([(potential(start), start)], [(-potential(goal), goal)])
+    best = 0 if start == goal else INF
+    meet = start if start == goal else None
+    nodes_expanded = 0
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        _, u = heapq.heappop(heaps[side])
+        if u in visited[side]:
+            continue
+        visited[side].add(u)
+        nodes_expanded += 1
+        dist, other = dists[side], dists[1 - side]
+        cost = dist[u]
+        for v, w in nbrs[u]:
+            new_cost = cost + w
+            if v not in dist or new_cost < dist[v]:
+                dist[v] = new_cost
+                parents[side][v] = u
+                heapq.heappush(heaps[side], (new_cost + signs[side] * potential(v), v))
+            if v in other and dist[v] + other[v] < best:
+                best = dist[v] + other[v]
+                meet = v
+
+    path = None
+    if meet is not None:
+        path = reconstruct_path(parents[0], start, meet)
+        node = meet
+        while node != goal:
+            node = parents[1][node]
+            path.append(node)
+    return {
+        "path": path,
+        "nodes": nodes_expanded,
+        "time": time.perf_counter() - start_time,
+        "cost": best if meet is not None else None
+    }
+
+#Multi-query shortest paths
+# Queries are grouped by source and answered from one Dijkstra per source that stops
+# as soon as all of that source's targets are settled. The (dist, parents, settled)
+# arrays are kept in an LRU cache bounded by memory_budget bytes.
+class ShortestPathEngine:
+    def __init__(self, adj, memory_budget=64 * 2**20):
+        self.graph = as_csr(adj)
+        self.memory_budget = memory_budget
+        self.cache = OrderedDict()
+        self.cache_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _search(self, source, targets):
+        graph = self.graph
+        nbrs = graph.adjacency()
+        dist = [INF] * graph.n
+        parents = [-1] * graph.n
+        settled = bytearray(graph.n)
+        remaining = set(targets)
+        dist[source] = 0
+        pq = [(0, source)]
+        nodes_expanded = 0
+        while pq and remaining:
+            cost, u = heapq.heappop(pq)
+            if settled[u]:
+                continue
+            settled[u] = 1
+            nodes_expanded += 1
+            remaining.discard(u)
+            for v, w in nbrs[u]:
+                new_cost = cost + w
+                if new_cost < dist[v]:
+                    dist[v] = new_cost
+                    parents[v] = u
+                    heapq.heappush(pq, (new_cost, v))
+        entry = (np.array(dist), np.array(parents, dtype=np.int64),
+                 np.frombuffer(settled, dtype=bool), set(targets))
+        return entry, nodes_expanded
+
+    def _store(self, source, entry):
+        old = self.cache.pop(source, None)
+        if old is not None:
+            self.cache_bytes -= sum(a.nbytes for a in old[:3])
+        self.cache[source] = entry
+        self.cache_bytes += sum(a.nbytes for a in entry[:3])
+        while self.cache_bytes > self.memory_budget and len(self.cache) > 1:
+            _, evicted = self.cache.popitem(last=False)
+            self.cache_bytes -= sum(a.nbytes for a in evicted[:3])
+
+    def _entry(self, source, targets):
+        entry = self.cache.get(source)
+        if entry is not None and all(entry[2][t] for t in targets):
+            self.cache.move_to_end(source)
+            self.hits += 1
+            return entry, 0
+        self.misses += 1
+        if entry is not None:
+            # keep serving the targets the cached run already covered
+            targets = set(targets) | entry[3]
+        entry, nodes_expanded = self._search(source, targets)
+        self._store(source, entry)
+        return entry, nodes_expanded
+
+    def _result(self, entry, source, goal, nodes_expanded, elapsed):
+        dist, parents, settled, _ = entry
+        if dist[goal] == INF:
+            return {"path": None, "nodes": nodes_expanded, "time": elapsed, "cost": None}
+        path = [goal]
+        while path[-1] != source:
+            path.append(int(parents[path[-1]]))
+        return {"path": path[::-1], "nodes": nodes_expanded, "time": elapsed, "cost": int(dist[goal])}
+
+    def query(self, start, goal):
+        return self.query_many([(start, goal)])[0]
+
+    # same result dicts as ucs, in the order of pairs; nodes/time are per source group
+    def query_many(self, pairs):
+        groups = OrderedDict()
+        for i, (s, d) in enumerate(pairs):
+            groups.setdefault(s, []).append((i, d))
+        results = [None] * len(pairs)
+        for source, items in groups.items():
+            start_time = time.perf_counter()
+            entry, nodes_expanded = self._entry(source, [d for _, d in items])
+            elapsed = time.perf_counter() - start_time
+            for i, d in items:
+                results[i] = self._result(entry, source, d, nodes_expanded, elapsed)
+        return results
+
+    # all-pairs distance matrix; sources are spread over a process pool that reads the
+    # CSR arrays and writes its rows through shared memory
+    def all_pairs(self, processes=None, chunk_size=64):
+        graph = self.graph
+        n = graph.n
+        arrays = [graph.indptr, graph.indices, graph.weights]
+        blocks = [shared_memory.SharedMemory(create=True, size=max(a.nbytes, 1)) for a in arrays]
+        blocks.append(shared_memory.SharedMemory(create=True, size=max(n * n * 8, 1)))
+        try:
+            for block, a in zip(blocks, arrays):
+                np.ndarray(a.shape, dtype=np.int64, buffer=block.buf)[:] = a
+            names = [b.name for b in blocks]
+            chunks = [range(i, min(i + chunk_size, n)) for i in range(0, n, chunk_size)]
+            with mp.Pool(processes, initializer=_attach_shared_csr,
+                         initargs=(names, n, len(graph.indices))) as pool:
+                pool.map(_all_pairs_rows, chunks)
+            return np.ndarray((n, n), dtype=np.float64, buffer=blocks[3].buf).copy()
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+_shared_csr = {}
+
+def _attach_shared_csr(names, n, nnz):
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    indptr = np.ndarray((n + 1,), dtype=np.int64, buffer=blocks[0].buf)
+    indices = np.ndarray((nnz,), dtype=np.int64, buffer=blocks[1].buf)
+    weights = np.ndarray((nnz,), dtype=np.int64, buffer=blocks[2].buf)
+    _shared_csr["graph"] = CSRGraph(indptr, indices, weights)
+    _shared_csr["out"] = np.ndarray((n, n), dtype=np.float64, buffer=blocks[3].buf)
+    _shared_csr["blocks"] = blocks
+
+def _all_pairs_rows(sources):
+    graph, out = _shared_csr["graph"], _shared_csr["out"]
+    for source in sources:
+        out[source] = dijkstra_all(graph, source)
+    return len(sources)
+
 # Experiment
-n = 1000
-num_pairs = 5
-while True:
-    G = generate_weighted_graph(n, extra_edges_factor=2, weight_range=(1, 20))
-    if is_connected(G):
-        break
-
-pairs = []
-for _ in range(num_pairs):
-    s, d = random.sample(range(n), 2)
-    pairs.append((s, d))
-
-results = []
-for s, d in pairs:
-    r_bfs = bfs(G, s, d)
-    r_dfs = dfs(G, s, d)
-    r_ucs = ucs(G, s, d)
-    r_ids = ids(G, s, d)
-    for name, res in [("BFS", r_bfs), ("DFS", r_dfs), ("UCS", r_ucs), ("IDS", r_ids)]:
-        p = res.get("path")
-        results.append({
-            "start": s,
-            "goal": d,
-            "algorithm": name,
-            "nodes_expanded": res["nodes"],
-            "time_sec": res["time"],
-            "path_length": len(p)-1 if p else None,
-            "path_cost": path_cost(G, p)
-        })
-
-df = pd.DataFrame(results)
-summary = df.groupby("algorithm").mean(numeric_only=True)
-summary=summary.drop(["start", "goal"], axis=1)
-pd.set_option("display.max_columns", None)
-
-
-print("Comparison of Algorithms:\n", summary)
+if __name__ == "__main__":
+    n = 1000
+    num_pairs = 5
+    while True:
+        G = generate_weighted_graph(n, extra_edges_factor=2, weight_range=(1, 20))
+        if is_connected(G):
+            break
+    G = CSRGraph.from_adj(G)
+
+    build_landmarks(G)
+    engine = ShortestPathEngine(G)
+
+    pairs = []
+    for _ in range(num_pairs):
+        s, d = random.sample(range(n), 2)
+        pairs.append((s, d))
+
+    results = []
+    for s, d in pairs:
+        r_bfs = bfs(G, s, d)
+        r_dfs = dfs(G, s, d)
+        r_ucs = ucs(G, s, d)
+        r_ids = ids(G, s, d)
+        r_astar = astar(G, s, d)
+        r_bi = bidirectional_ucs(G, s, d)
+        r_engine = engine.query(s, d)
+        for name, res in [("BFS", r_bfs), ("DFS", r_dfs), ("UCS", r_ucs), ("IDS", r_ids),
+                          ("A* (ALT)", r_astar), ("Bidirectional UCS (ALT)", r_bi),
+                          ("UCS (query engine)", r_engine)]:
+            p = res.get("path")
+            results.append({
+                "start": s,
+                "goal": d,
+                "algorithm": name,
+                "nodes_expanded": res["nodes"],
+                "time_sec": res["time"],
+                "path_length": len(p)-1 if p else None,
+                "path_cost": path_cost(G, p)
+            })
+
+    df = pd.DataFrame(results)
+    summary = df.groupby("algorithm").mean(numeric_only=True)
+    summary=summary.drop(["start", "goal"], axis=1)
+    pd.set_option("display.max_columns", None)
+
+
+    print("Comparison of Algorithms:\n", summary)
@@ -0,0 +1,149 @@
+import multiprocessing as mp
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+
+from eight_puz import generate_random_state, ida_star, is_solvable, manhattan, next_states, pack
+
+# Batch solving: start states are deduplicated, looked up in an on-disk cache and
+# the rest are solved with IDA* on a process pool. Results stream back as
+# (state, moves, nodes, time) in completion order.
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solutions.sqlite")
+GOAL_STATE = (1, 2, 3, 4, 5, 6, 7, 8, 0)
+MOVE_LETTERS = {"UP": "U", "DOWN": "D", "LEFT": "L", "RIGHT": "R"}
+LETTER_MOVES = {v: k for k, v in MOVE_LETTERS.items()}
+
+# "1 2 3 4 0 5 6 7 8", "1,2,3,4,0,5,6,7,8" or "123405678"
+def parse_state(line):
+    tokens = line.replace(",", " ").split()
+    if len(tokens) == 1:
+        tokens = list(tokens[0])
+    return tuple(int(t) for t in tokens)
+
+def read_states(path):
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield parse_state(line)
+
+def path_states(state, moves):
+    states = [state]
+    for move in moves:
+        for nxt, mv in next_states(states[-1]):
+            if mv == move:
+                states.append(nxt)
+                break
+    return states
+
+
+# Optimal move sequences keyed by (packed goal, packed state). Packed boards are
+# stored as hex text because 15-puzzle codes do not fit a signed 64-bit INTEGER.
+class SolutionCache:
+    def __init__(self, path=CACHE_PATH):
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS solutions "
+                          "(goal TEXT, state TEXT, moves TEXT, PRIMARY KEY (goal, state))")
+        self.conn.commit()
+
+    def get(self, state, goal):
+        row = self.conn.execute("SELECT moves FROM solutions WHERE goal = ? AND state = ?",
+                                ("%x" % pack(goal), "%x" % pack(state))).fetchone()
+        if row is None:
+            return None
+        return [LETTER_MOVES[c] for c in row[0]]
+
+    # every suffix of an optimal path is optimal, so each state on it gets an entry
+    def put_path(self, states, moves, goal):
+        goal_key = "%x" % pack(goal)
+        letters = "".join(MOVE_LETTERS[m] for m in moves)
+        rows = [(goal_key, "%x" % pack(s), letters[i:]) for i, s in enumerate(states)]
+        self.conn.executemany("INSERT OR IGNORE INTO solutions VALUES (?, ?, ?)", rows)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+_worker_cache = None
+
+def _init_worker(cache_path):
+    global _worker_cache
+    _worker_cache = SolutionCache(cache_path) if cache_path else None
+
+def _solve(task):
+    state, goal = task
+    start = time.perf_counter()
+    # another task may have solved a path through this state since it was queued
+    if _worker_cache is not None:
+        moves = _worker_cache.get(state, goal)
+        if moves is not None:
+            return state, moves, 0, time.perf_counter() - start
+    if is_solvable(state) != is_solvable(goal):
+        return state, None, 0, time.perf_counter() - start
+    stats = []
+    _, moves = ida_star(state, goal, manhattan, stats)
+    return state, moves, sum(n for _, n in stats), time.perf_counter() - start
+
+# The pool's task thread pulls states from the input while workers run, so the
+# first results come back before the input is read to the end. Workers check the
+# cache before solving. A repeat of a state still being solved bumps its count; a
+# repeat of a finished state reuses its result.
+def solve_batch(states, goal_state=GOAL_STATE, processes=None, cache_path=CACHE_PATH):
+    if isinstance(states, str):
+        states = read_states(states)
+    cache = SolutionCache(cache_path) if cache_path else None
+    lock = threading.Lock()
+    counts = {}
+    finished = {}
+    late = deque()
+
+    def tasks():
+        for state in states:
+            state = tuple(state)
+            with lock:
+                if state in finished:
+                    late.append(finished[state])
+                    continue
+                if state in counts:
+                    counts[state] += 1
+                    continue
+                counts[state] = 1
+            yield state, goal_state
+
+    try:
+        with mp.Pool(processes, initializer=_init_worker, initargs=(cache_path,)) as pool:
+            for result in pool.imap_unordered(_solve, tasks()):
+                state, moves, nodes, _ = result
+                if cache and moves is not None and nodes:
+                    cache.put_path(path_states(state, moves), moves, goal_state)
+                with lock:
+                    finished[state] = result
+                    repeats = counts.pop(state)
+                for _ in range(repeats):
+                    yield result
+                while late:
+                    yield late.popleft()
+        while late:
+            yield late.popleft()
+    finally:
+        if cache:
+            cache.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        source = sys.argv[1]
+    else:
+        source = [generate_random_state() for _ in range(20)]
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    total_start = time.perf_counter()
+    for state, moves, nodes, elapsed in solve_batch(source, processes=processes):
+        length = len(moves) if moves is not None else None
+        print(f'{state}: moves={length} nodes={nodes} time={elapsed:.4f}s')
+    print(f'Total time: {time.perf_counter() - total_start:.4f}s')
@@ -1,6 +1,11 @@
+import functools
 import heapq
 import itertools
+import math
 import random
+from packed import (BLANK_MOVES, MOVE_NAMES, blank_moves, is_solvable, load_distance_table, pack,
+                    packed_states_moves, slide, splice_paths, unpack)
+from pattern_db import load_pattern_database
 
 def swap(state, pos1, pos2):
     state_ = list(state)
@@ -9,28 +14,28 @@ def swap(state, pos1, pos2):
 
 def next_states(state):
     next_state = []
+    width = math.isqrt(len(state))
     empty_block_idx = state.index(0)
-    row = empty_block_idx // 3
-    col = empty_block_idx % 3
+    row = empty_block_idx // width
+    col = empty_block_idx % width
 
     if row > 0:
-        next_state.append((swap(state, empty_block_idx, empty_block_idx - 3), "UP"))
-    if row < 2:
-        next_state.append((swap(state, empty_block_idx, empty_block_idx + 3), "DOWN"))
+        next_state.append((swap(state, empty_block_idx, empty_block_idx - width), "UP"))
+    if row < width - 1:
+        next_state.append((swap(state, empty_block_idx, empty_block_idx + width), "DOWN"))
     if col > 0:
         next_state.append((swap(state, empty_block_idx, empty_block_idx - 1), "LEFT"))
-    if col < 2:
+    if col < width - 1:
         next_state.append((swap(state, empty_block_idx, empty_block_idx + 1), "RIGHT"))
 
     return next_state
 
 def manhattan(state, goal):
+    dist = goal_tables(goal)[1]
+    size = len(state)
     h = 0
     for i, val in enumerate(state):
-        if val == 0:
-            continue
-        goal_idx = goal.index(val)
-        h += abs(goal_idx // 3 - i // 3) + abs(goal_idx % 3 - i % 3)
+        h += dist[val * size + i]
     return h
 
 def reconstruct_path(parent, end_state):
@@ -46,10 +51,15 @@ def reconstruct_path(parent, end_state):
     moves.reverse()
     return states, moves[1:]
 
-def a_star(initial_state, goal_state, heruistic):
+def a_star(initial_state, goal_state, heruistic, table=None):
+    if table is not None:
+        return table.query(initial_state, goal_state)
     parent = {initial_state: (None, None)}
     g_score = {initial_state: 0}
     closed = set()
+    size = len(goal_state)
+    _, _, delta, moves_table = goal_tables(goal_state)
+    incremental = heruistic is manhattan
 
     counter = itertools.count()
     start_f = heruistic(initial_state, goal_state)
@@ -66,20 +76,162 @@ def a_star(initial_state, goal_state, heruistic):
         closed.add(state)
 
         current_g = g_score[state]
+        h = f - current_g
+        blank = state.index(0)
 
-        for neighbour, move in next_states(state):
+        for pos, move in moves_table[blank]:
+            neighbour = swap(state, blank, pos)
             tentative_g = current_g + 1 
             if neighbour in closed:
                 continue
 
             if tentative_g < g_score.get(neighbour, float('inf')):
-                parent[neighbour] = (state, move)
+                parent[neighbour] = (state, MOVE_NAMES[move])
                 g_score[neighbour] = tentative_g
-                f_score = tentative_g + heruistic(neighbour, goal_state)
+                if incremental:
+                    # only the slid tile changes its distance to the goal
+                    f_score = tentative_g + h + delta[(state[pos] * size + pos) * size + blank]
+                else:
+                    f_score = tentative_g + heruistic(neighbour, goal_state)
                 heapq.heappush(open_heap, (f_score, next(counter), neighbour))
 
     return None
 
+# Per-goal lookup tables, built once and shared by every solve against that goal:
+#   coords[tile]                      -> (row, col) of the tile in the goal
+#   dist[tile * size + pos]           -> Manhattan distance of tile standing at pos
+#   delta[(tile * size + src) * size + dst] -> change in h when tile slides src -> dst
+#   moves[blank]                      -> ((pos, move index), ...) blank adjacency
+# The cache is bounded: bidirectional A* also builds tables towards each start state.
+@functools.lru_cache(maxsize=64)
+def goal_tables(goal, size=9):
+    board = unpack(goal, size) if isinstance(goal, int) else tuple(goal)
+    size = len(board)
+    width = math.isqrt(size)
+    coords = [None] * size
+    for idx, val in enumerate(board):
+        coords[val] = (idx // width, idx % width)
+
+    dist = [0] * (size * size)
+    for tile in range(1, size):
+        row, col = coords[tile]
+        for pos in range(size):
+            dist[tile * size + pos] = abs(row - pos // width) + abs(col - pos % width)
+
+    delta = [0] * (size * size * size)
+    for tile in range(1, size):
+        for src in range(size):
+            for dst in range(size):
+                delta[(tile * size + src) * size + dst] = dist[tile * size + dst] - dist[tile * size + src]
+
+    return coords, dist, delta, blank_moves(width)
+
+def manhattan_packed(code, goal_code, size=9):
+    dist = goal_tables(goal_code, size)[1]
+    h = 0
+    for i in range(size):
+        h += dist[((code >> (4 * i)) & 0xF) * size + i]
+    return h
+
+# heap entries are single ints: f | insertion counter | packed board | blank
+# heuristic(code, goal_code, size) works on packed boards
+def a_star_packed(initial_state, goal_state, heuristic=manhattan_packed):
+    start, goal = pack(initial_state), pack(goal_state)
+    parent = {start: -1}
+    g_score = {start: 0}
+    closed = set()
+    size = len(goal_state)
+    _, _, delta, moves_table = goal_tables(goal, size)
+    incremental = heuristic is manhattan_packed
+    entry_bits = 4 * size + 4
+    f_shift = entry_bits + 40
+
+    counter = itertools.count()
+    entry = start << 4 | initial_state.index(0)
+    open_heap = [heuristic(start, goal, size) << f_shift | next(counter) << entry_bits | entry]
+
+    while open_heap:
+        entry = heapq.heappop(open_heap)
+        f = entry >> f_shift
+        entry &= (1 << entry_bits) - 1
+        code, blank = entry >> 4, entry & 0xF
+
+        if code == goal:
+            return packed_states_moves(code, parent, size)
+
+        if code in closed:
+            continue
+        closed.add(code)
+
+        h = f - g_score[code]
+        tentative_g = g_score[code] + 1
+        for pos, move in moves_table[blank]:
+            neighbour = slide(code, blank, pos)
+            if neighbour in closed:
+                continue
+
+            if tentative_g < g_score.get(neighbour, float('inf')):
+                parent[neighbour] = code << 2 | move
+                g_score[neighbour] = tentative_g
+                if incremental:
+                    tile = (code >> (4 * pos)) & 0xF
+                    f_score = tentative_g + h + delta[(tile * size + pos) * size + blank]
+                else:
+                    f_score = tentative_g + heuristic(neighbour, goal, size)
+                heapq.heappush(open_heap, f_score << f_shift | next(counter) << entry_bits | neighbour << 4 | pos)
+
+    return None
+
+# Side 0 searches from the start towards the goal, side 1 from the goal towards the start.
+# Stops once the best meeting cost is no larger than the smallest f on either open list.
+def bidirectional_a_star(initial_state, goal_state, heuristic=manhattan_packed):
+    if is_solvable(initial_state) != is_solvable(goal_state):
+        return None
+    start, goal = pack(initial_state), pack(goal_state)
+    size = len(goal_state)
+    if start == goal:
+        return [initial_state], []
+    moves_table = goal_tables(goal, size)[3]
+
+    targets = (goal, start)
+    parents = ({start: -1}, {goal: -1})
+    g_scores = ({start: 0}, {goal: 0})
+    closed = (set(), set())
+    counter = itertools.count()
+    heaps = ([(heuristic(start, goal, size), next(counter), start << 4 | initial_state.index(0))],
+             [(heuristic(goal, start, size), next(counter), goal << 4 | goal_state.index(0))])
+    best = float('inf')
+    meet = None
+
+    while heaps[0] and heaps[1]:
+        if best <= max(heaps[0][0][0], heaps[1][0][0]):
+            break
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        _, _, entry = heapq.heappop(heaps[side])
+        code, blank = entry >> 4, entry & 0xF
+        if code in closed[side]:
+            continue
+        closed[side].add(code)
+
+        parent, g_score, other_g = parents[side], g_scores[side], g_scores[1 - side]
+        tentative_g = g_score[code] + 1
+        for pos, move in moves_table[blank]:
+            neighbour = slide(code, blank, pos)
+            if neighbour in closed[side]:
+                continue
+            if tentative_g < g_score.get(neighbour, float('inf')):
+                parent[neighbour] = code << 2 | move
+                g_score[neighbour] = tentative_g
+                f_score = tentative_g + heuristic(neighbour, targets[side], size)
+                heapq.heappush(heaps[side], (f_score, next(counter), neighbour << 4 | pos))
+                if neighbour in other_g and tentative_g + other_g[neighbour] < best:
+                    best = tentative_g + other_g[neighbour]
+                    meet = neighbour
+
+    if meet is None:
+        return None
+    return splice_paths(meet, parents[0], parents[1], size)
+
 def rbfs(initial_state, goal_state, heuristic):
     def rbfs_rec(state, path, f, f_limit):
         if state == goal_state:
@@ -113,46 +265,136 @@ def rbfs(initial_state, goal_state, heuristic):
         return states, moves
     return None
 
+# IDA*: depth-first iterations under a growing f-bound. The board is changed in
+# place and undone on backtrack, and every per-depth value lives in buffers that
+# only grow with the search depth, so nothing is allocated per node.
+def ida_star(initial_state, goal_state, heuristic=manhattan, stats=None):
+    size = len(goal_state)
+    _, _, delta, moves_table = goal_tables(goal_state)
+    incremental = heuristic is manhattan
+    goal = list(goal_state)
+    board = list(initial_state)
+    if board == goal:
+        return [initial_state], []
 
-def is_solvable(state):
-    arr = [x for x in state if x != 0]
-    inversions = 0
-    for i in range(len(arr)):
-        for j in range(i+1, len(arr)):
-            if arr[i] > arr[j]:
-                inversions += 1
-    return inversions % 2 == 0
+    # blanks[d]: blank position at depth d, tried[d]: next move index to try there,
+    # hs[d]: heuristic at depth d, path[d]: move index taken from depth d
+    blanks = [board.index(0)]
+    tried = [0]
+    hs = [heuristic(initial_state, goal_state)]
+    path = []
+    bound = hs[0]
 
-def generate_random_state():
     while True:
-        nums = list(range(9))
+        nodes = 1
+        next_bound = float('inf')
+        depth = 0
+        tried[0] = 0
+        while depth >= 0:
+            blank = blanks[depth]
+            options = moves_table[blank]
+            i = tried[depth]
+            if i == len(options):
+                depth -= 1
+                if depth >= 0:
+                    prev = blanks[depth]
+                    board[blank] = board[prev]
+                    board[prev] = 0
+                continue
+            tried[depth] = i + 1
+
+            pos, move = options[i]
+            if depth and pos == blanks[depth - 1]:
+                continue  # would undo the previous move
+            tile = board[pos]
+            board[blank] = tile
+            board[pos] = 0
+            if incremental:
+                h = hs[depth] + delta[(tile * size + pos) * size + blank]
+            else:
+                h = heuristic(board, goal_state)
+            f = depth + 1 + h
+            if f > bound:
+                if f < next_bound:
+                    next_bound = f
+                board[pos] = tile
+                board[blank] = 0
+                continue
+
+            nodes += 1
+            depth += 1
+            if depth == len(blanks):
+                blanks.append(pos)
+                tried.append(0)
+                hs.append(h)
+                path.append(move)
+            else:
+                blanks[depth] = pos
+                tried[depth] = 0
+                hs[depth] = h
+                path[depth - 1] = move
+
+            if board == goal:
+                if stats is not None:
+                    stats.append((bound, nodes))
+                states = [initial_state]
+                for d in range(depth):
+                    states.append(swap(states[-1], blanks[d], blanks[d + 1]))
+                return states, [MOVE_NAMES[m] for m in path[:depth]]
+
+        if stats is not None:
+            stats.append((bound, nodes))
+        if next_bound == float('inf'):
+            return None
+        bound = next_bound
+
+# Default solver for random instances: IDA* only needs memory proportional to the depth
+def solve_puzzle(initial_state, goal_state, heuristic=manhattan, stats=None):
+    if is_solvable(initial_state) != is_solvable(goal_state):
+        return None
+    return ida_star(initial_state, goal_state, heuristic, stats)
+
+
+def generate_random_state(width=3):
+    while True:
+        nums = list(range(width * width))
         random.shuffle(nums)
         state = tuple(nums)
         if is_solvable(state):
             return state
 
 
-initial_state = generate_random_state()
-goal_state = (1,2,3,4,5,6,7,8,0)
-
-print("____A* SOLUTION____")    
-if a_star(initial_state, goal_state, manhattan) is not None:
-    states, moves = a_star(initial_state, goal_state, manhattan)
+def print_solution(title, result):
+    print(f"____{title} SOLUTION____")
+    if result is None:
+        print("No solution.")
+        return
+    states, moves = result
     print(f'Initial State: {states[0]}')
     for i in range(len(moves)):
         print(f'Move: {moves[i]}')
         print(f'State: {states[i+1]}')
     print(f'Total Moves = {len(moves)}')
-else:
-    print("No solution.")
 
-print("____RBFS SOLUTION____")    
-if rbfs(initial_state, goal_state, manhattan) is not None:
-    states, moves = rbfs(initial_state, goal_state, manhattan)
-    print(f'Initial State: {states[0]}')
-    for i in range(len(moves)):
-        print(f'Move: {moves[i]}')
-        print(f'State: {states[i+1]}')
-    print(f'Total Moves = {len(moves)}')
-else:
-    print("No solution.")
\ No newline at end of file
+
+if __name__ == "__main__":
+    initial_state = generate_random_state()
+    goal_state = (1,2,3,4,5,6,7,8,0)
+
+    print_solution("A*", a_star(initial_state, goal_state, manhattan))
+
+    pdb = load_pattern_database(3, goal_state)
+    print_solution("A* (PATTERN DATABASE)", a_star(initial_state, goal_state, pdb))
+
+    print_solution("RBFS", rbfs(initial_state, goal_state, manhattan))
+
+    iterations = []
+    print_solution("IDA*", solve_puzzle(initial_state, goal_state, manhattan, iterations))
+    for bound, nodes in iterations:
+        print(f'Threshold {bound}: {nodes} nodes expanded')
+
+    print_solution("BIDIRECTIONAL A*", bidirectional_a_star(initial_state, goal_state))
+
+    table = load_distance_table(goal_state)
+    print(f'Optimal distance: {table.distance(initial_state)}')
+    print_solution("DISTANCE TABLE", a_star(initial_state, goal_state, manhattan, table))
@@ -0,0 +1,164 @@
+import math
+import mmap
+import os
+
+# Packed states for the WEEK3 puzzle solvers: tile at index i lives in bits
+# 4*i .. 4*i+3 of one integer
+MOVE_NAMES = ("UP", "DOWN", "LEFT", "RIGHT")
+
+def blank_moves(width=3):
+    table = []
+    for idx in range(width * width):
+        row, col = idx // width, idx % width
+        options = []
+        if row > 0:
+            options.append((idx - width, 0))
+        if row < width - 1:
+            options.append((idx + width, 1))
+        if col > 0:
+            options.append((idx - 1, 2))
+        if col < width - 1:
+            options.append((idx + 1, 3))
+        table.append(tuple(options))
+    return tuple(table)
+
+BLANK_MOVES = blank_moves()
+
+def pack(state):
+    code = 0
+    for i, val in enumerate(state):
+        code |= val << (4 * i)
+    return code
+
+def unpack(code, size=9):
+    return tuple((code >> (4 * i)) & 0xF for i in range(size))
+
+def slide(code, blank, pos):
+    # move the tile at pos into the blank, returns the new packed board
+    tile = (code >> (4 * pos)) & 0xF
+    return code - (tile << (4 * pos)) + (tile << (4 * blank))
+
+# parent[code] = (previous code << 2) | move index, -1 for the start
+def packed_states_moves(code, parent, size=9):
+    states = []
+    moves = []
+    while True:
+        states.append(unpack(code, size))
+        link = parent[code]
+        if link < 0:
+            break
+        moves.append(MOVE_NAMES[link & 3])
+        code = link >> 2
+    states.reverse()
+    moves.reverse()
+    return states, moves
+
+# forward chain start -> meet, then the backward chain meet -> goal with its moves reversed
+def splice_paths(meet, forward_parent, backward_parent, size=9):
+    states, moves = packed_states_moves(meet, forward_parent, size)
+    link = backward_parent[meet]
+    while link >= 0:
+        states.append(unpack(link >> 2, size))
+        moves.append(MOVE_NAMES[(link & 3) ^ 1])  # UP<->DOWN, LEFT<->RIGHT
+        link = backward_parent[link >> 2]
+    return states, moves
+
+def is_solvable(state):
+    arr = [x for x in state if x != 0]
+    inversions = 0
+    for i in range(len(arr)):
+        for j in range(i+1, len(arr)):
+            if arr[i] > arr[j]:
+                inversions += 1
+    width = math.isqrt(len(state))
+    if width % 2 == 0:
+        # even widths: the blank's row (counted from the bottom) flips the parity
+        return (inversions + width - state.index(0) // width) % 2 == 1
+    return inversions % 2 == 0
+
+
+# Perfect distance table: one byte per permutation of the board, indexed by its
+# Lehmer rank, holding the optimal number of moves to the goal (255 = unreachable)
+TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+FACTORIALS = tuple(math.factorial(i) for i in range(9))
+UNREACHED = 255
+
+def packed_rank(code, size=9):
+    rank = 0
+    used = 0
+    for i in range(size):
+        val = (code >> (4 * i)) & 0xF
+        rank += (val - (used & ((1 << val) - 1)).bit_count()) * FACTORIALS[size - 1 - i]
+        used |= 1 << val
+    return rank
+
+def perm_rank(state):
+    return packed_rank(pack(state), len(state))
+
+# Retrograde BFS from the goal over the packed states
+def build_distance_table(goal_state):
+    table = bytearray([UNREACHED]) * math.factorial(len(goal_state))
+    table[perm_rank(goal_state)] = 0
+    frontier = [pack(goal_state) << 4 | goal_state.index(0)]
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for entry in frontier:
+            code, blank = entry >> 4, entry & 0xF
+            for pos, _ in BLANK_MOVES[blank]:
+                nxt = slide(code, blank, pos)
+                idx = packed_rank(nxt)
+                if table[idx] == UNREACHED:
+                    table[idx] = depth
+                    next_frontier.append(nxt << 4 | pos)
+        frontier = next_frontier
+    return table
+
+class DistanceTable:
+    def __init__(self, goal_state, data):
+        self.goal = tuple(goal_state)
+        self.data = data
+
+    def distance(self, state):
+        if len(state) != len(self.goal):
+            raise ValueError("Distance table was built for a %d-cell board" % len(self.goal))
+        d = self.data[perm_rank(state)]
+        return None if d == UNREACHED else d
+
+    # greedy walk: some neighbour is always exactly one move closer to the goal
+    def solve(self, state):
+        d = self.distance(state)
+        if d is None:
+            return None
+        code, blank = pack(state), state.index(0)
+        states = [tuple(state)]
+        moves = []
+        while d > 0:
+            for pos, move in BLANK_MOVES[blank]:
+                nxt = slide(code, blank, pos)
+                if self.data[packed_rank(nxt)] == d - 1:
+                    break
+            code, blank = nxt, pos
+            states.append(unpack(code))
+            moves.append(MOVE_NAMES[move])
+            d -= 1
+        return states, moves
+
+    def query(self, initial_state, goal_state):
+        if tuple(goal_state) != self.goal:
+            raise ValueError("Distance table was built for a different goal state")
+        return self.solve(initial_state)
+
+def load_distance_table(goal_state, directory=TABLE_DIR):
+    if len(goal_state) != 9:
+        raise ValueError("Perfect distance tables are only built for the 8-puzzle")
+    path = os.path.join(directory, "dist_%s.bin" % "".join(map(str, goal_state)))
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(build_distance_table(goal_state))
+        os.replace(tmp, path)
+    with open(path, "rb") as f:
+        return DistanceTable(goal_state, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
@@ -0,0 +1,157 @@
+import math
+import mmap
+import os
+from array import array
+
+# Additive disjoint pattern databases for the (width*width - 1)-puzzle.
+# Every pattern table stores, for each placement of its tiles, the number of
+# moves of those tiles needed to reach the goal placement. The abstract state also
+# tracks the blank, which only moves through cells not held by pattern tiles; blank
+# moves and moves of tiles outside the pattern are free, so the tables of disjoint
+# patterns can be summed.
+
+PDB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pdb")
+UNSEEN = 255
+
+def default_goal(width):
+    return tuple(range(1, width * width)) + (0,)
+
+def default_patterns(width):
+    if width == 3:
+        return [(1, 2, 3, 4), (5, 6, 7, 8)]
+    if width == 4:
+        return [(1, 2, 3, 5, 6), (4, 7, 8, 11, 12), (9, 10, 13, 14, 15)]
+    tiles = list(range(1, width * width))
+    return [tuple(tiles[i:i + 5]) for i in range(0, len(tiles), 5)]
+
+def cell_neighbours(width):
+    neighbours = []
+    for pos in range(width * width):
+        row, col = pos // width, pos % width
+        adj = []
+        if row > 0:
+            adj.append(pos - width)
+        if row < width - 1:
+            adj.append(pos + width)
+        if col > 0:
+            adj.append(pos - 1)
+        if col < width - 1:
+            adj.append(pos + 1)
+        neighbours.append(tuple(adj))
+    return neighbours
+
+# Dense rank of k distinct cells out of size (a k-permutation), 0 .. perm(size, k)-1
+def rank_positions(positions, size):
+    index = 0
+    used = 0
+    for i, pos in enumerate(positions):
+        index = index * (size - i) + pos - (used & ((1 << pos) - 1)).bit_count()
+        used |= 1 << pos
+    return index
+
+# Retrograde 0-1 BFS from the goal placement over (pattern placement, blank cell).
+# depth holds the cost of every such state at index rank * size + blank. Each layer
+# first floods the blank through free cells at no cost, then swaps it with an
+# adjacent pattern tile at cost 1. The table keeps the minimum over blank cells.
+def build_pattern_table(goal, tiles, width):
+    size = width * width
+    neighbours = cell_neighbours(width)
+    placements = math.perm(size, len(tiles))
+    depth = bytearray([UNSEEN]) * (placements * size)
+
+    start = tuple(goal.index(t) for t in tiles)
+    blank = goal.index(0)
+    depth[rank_positions(start, size) * size + blank] = 0
+    frontier = [(start, rank_positions(start, size), blank)]
+    cost = 0
+    while frontier:
+        # free blank moves: every state reached in this layer has the same cost
+        layer = list(frontier)
+        for positions, rank, blank in frontier:
+            base = rank * size
+            occupied = 0
+            for pos in positions:
+                occupied |= 1 << pos
+            stack = [blank]
+            while stack:
+                cell = stack.pop()
+                for nxt in neighbours[cell]:
+                    if not occupied >> nxt & 1 and depth[base + nxt] == UNSEEN:
+                        depth[base + nxt] = cost
+                        layer.append((positions, rank, nxt))
+                        stack.append(nxt)
+
+        cost += 1
+        frontier = []
+        for positions, rank, blank in layer:
+            for nxt in neighbours[blank]:
+                if nxt not in positions:
+                    continue
+                i = positions.index(nxt)
+                child = positions[:i] + (blank,) + positions[i + 1:]
+                child_rank = rank_positions(child, size)
+                idx = child_rank * size + nxt
+                if depth[idx] == UNSEEN:
+                    depth[idx] = cost
+                    frontier.append((child, child_rank, nxt))
+
+    table = array('B', [UNSEEN]) * placements
+    for rank in range(placements):
+        table[rank] = min(depth[rank * size:(rank + 1) * size])
+    return table
+
+def pattern_path(directory, width, goal, tiles):
+    goal_key = "".join("%x" % v for v in goal)
+    return os.path.join(directory, "w%d_%s_%s_blank.bin" % (width, goal_key, "-".join(map(str, tiles))))
+
+def save_table(table, path):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        table.tofile(f)
+    os.replace(tmp, path)
+
+def load_table(path):
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class PatternDatabase:
+    def __init__(self, width, goal, patterns, tables):
+        self.width = width
+        self.size = width * width
+        self.goal = goal
+        self.patterns = patterns
+        self.tables = tables
+
+    # heuristic(state, goal) signature so it plugs into a_star / rbfs. The goal is fixed
+    # at build time, so any other goal is refused rather than given wrong estimates.
+    def __call__(self, state, goal=None):
+        if goal is not None and goal is not self.goal and tuple(goal) != self.goal:
+            raise ValueError("Pattern database was built for goal %s, not %s" % (self.goal, tuple(goal)))
+        size = self.size
+        where = [0] * size
+        for i, val in enumerate(state):
+            where[val] = i
+        h = 0
+        for tiles, table in zip(self.patterns, self.tables):
+            h += table[rank_positions([where[t] for t in tiles], size)]
+        return h
+
+
+def load_pattern_database(width=3, goal=None, patterns=None, directory=PDB_DIR):
+    goal = tuple(goal) if goal is not None else default_goal(width)
+    patterns = [tuple(p) for p in patterns] if patterns is not None else default_patterns(width)
+    if len(goal) != width * width:
+        raise ValueError("Goal does not match a %dx%d board" % (width, width))
+    tiles = [t for p in patterns for t in p]
+    if 0 in tiles or len(tiles) != len(set(tiles)):
+        raise ValueError("Patterns must be disjoint and must not contain the blank")
+
+    tables = []
+    for pattern in patterns:
+        path = pattern_path(directory, width, goal, pattern)
+        if not os.path.exists(path):
+            os.makedirs(directory, exist_ok=True)
+            save_table(build_pattern_table(goal, pattern, width), path)
+        tables.append(load_table(path))
+    return PatternDatabase(width, goal, patterns, tables)
@@ -1,33 +1,38 @@
-
+import multiprocessing as mp
 import random
+import time
 
 N = 8
 
+# Attacking pairs, counted per row and diagonal: a line holding c queens adds c*(c-1)/2
 def conflicts(state):
-    h = 0
-    s = list(state)
-    for i in range(N):
-        for j in range(i+1, N):
-            if s[i] == s[j] or abs(s[i]-s[j]) == abs(i-j):
-                h += 1
-    return h
+    n = len(state)
+    rows = [0] * n
+    diag1 = [0] * (2 * n - 1)
+    diag2 = [0] * (2 * n - 1)
+    for col, row in enumerate(state):
+        rows[row] += 1
+        diag1[row + col] += 1
+        diag2[row - col + n - 1] += 1
+    return sum(c * (c - 1) // 2 for line in (rows, diag1, diag2) for c in line)
 
-def random_state():
-    return tuple(random.randint(0, N-1) for _ in range(N))
+def random_state(n=N):
+    return tuple(random.randint(0, n-1) for _ in range(n))
 
 def neighbors(state):
+    n = len(state)
     result = []
-    for col in range(N):
-        for row in range(N):
+    for col in range(n):
+        for row in range(n):
             if state[col] != row:
                 new_state = list(state)
                 new_state[col] = row
                 result.append(tuple(new_state))
     return result
 
-def random_restart_hill_climb(max_restarts=50):
+def random_restart_hill_climb(max_restarts=50, n=N):
     for restart in range(max_restarts):
-        current = random_state()
+        current = random_state(n)
         path = [current]
         while True:
             h = conflicts(current)
@@ -35,25 +40,292 @@ def random_restart_hill_climb(max_restarts=50):
                 return path, current, restart
             next_state = min(neighbors(current), key=lambda n: conflicts(n))
             if conflicts(next_state) >= h:
-                break 
+                break
             current = next_state
             path.append(current)
     return None, None, max_restarts
 
 def print_board(state):
-    for r in range(N):
+    n = len(state)
+    for r in range(n):
         row = ""
-        for c in range(N):
+        for c in range(n):
             row += "Q " if state[c] == r else ". "
         print(row)
     print()
 
-path, solution, restarts = random_restart_hill_climb()
 
-if solution:
-    print(f"Solved after {restarts} restarts!\n")
-    for state in path:
-        print(f"Conflicts: {conflicts(state)}")
-        print_board(state)
-else:
-    print("Failed to solve within restart limit.")
\ No newline at end of file
+# Queens with occupancy counters per row and diagonal. Each line also keeps the xor
+# of the columns on it, so when a line goes from one queen to two the queen that
+# was already there is known in O(1).
+class QueensBoard:
+    def __init__(self, rows):
+        n = self.n = len(rows)
+        self.rows = list(rows)
+        self.count = [[0] * n, [0] * (2 * n - 1), [0] * (2 * n - 1)]
+        self.cols = [[0] * n, [0] * (2 * n - 1), [0] * (2 * n - 1)]
+        for col, row in enumerate(self.rows):
+            self._place(col, row)
+
+    def lines(self, col, row):
+        return row, row + col, row - col + self.n - 1
+
+    # queens (other than one standing there) attacking square (col, row)
+    def attacks(self, col, row):
+        row_count, d1, d2 = self.count
+        return row_count[row] + d1[row + col] + d2[row - col + self.n - 1]
+
+    def queen_conflicts(self, col):
+        return self.attacks(col, self.rows[col]) - 3
+
+    def _place(self, col, row):
+        newly = []
+        for count, cols, line in zip(self.count, self.cols, self.lines(col, row)):
+            count[line] += 1
+            if count[line] == 2:
+                newly.append(cols[line])
+            cols[line] ^= col
+        return newly
+
+    def _remove(self, col, row):
+        for count, cols, line in zip(self.count, self.cols, self.lines(col, row)):
+            count[line] -= 1
+            cols[line] ^= col
+
+    # O(1) change in this queen's conflicts if it moved to new_row
+    def move_delta(self, col, new_row):
+        return self.attacks(col, new_row) - self.queen_conflicts(col)
+
+    # moves the queen and returns the queens that became attacked by it
+    def move(self, col, new_row):
+        self._remove(col, self.rows[col])
+        self.rows[col] = new_row
+        return self._place(col, new_row)
+
+    # O(1) change in attacking pairs if queens a and b exchanged rows. Row counts do
+    # not change; on each diagonal family four lines change by one queen (some may
+    # coincide) and a line going from c to c + d queens adds d*c + d*(d-1)/2 pairs.
+    def swap_delta(self, a, b):
+        ra, rb = self.rows[a], self.rows[b]
+        offset = self.n - 1
+        delta = 0
+        for count, lines in ((self.count[1], (ra + a, rb + b, rb + a, ra + b)),
+                             (self.count[2], (ra - a + offset, rb - b + offset, rb - a + offset, ra - b + offset))):
+            change = {}
+            for line, d in zip(lines, (-1, -1, 1, 1)):
+                change[line] = change.get(line, 0) + d
+            for line, d in change.items():
+                delta += d * count[line] + d * (d - 1) // 2
+        return delta
+
+    def swap(self, a, b):
+        ra, rb = self.rows[a], self.rows[b]
+        return self.move(a, rb) + self.move(b, ra)
+
+    def state(self):
+        return tuple(self.rows)
+
+
+# Greedy start (Sosic & Gu): rows form a random permutation and each column takes,
+# from the rows still unused, one whose diagonals are free, so usually only the
+# last few columns are left in conflict.
+def greedy_permutation(n, rng, tries=50):
+    perm = list(range(n))
+    d1 = bytearray(2 * n - 1)
+    d2 = bytearray(2 * n - 1)
+    rand = rng.random
+    for col in range(n):
+        remaining = n - col
+        for _ in range(tries):
+            j = col + int(rand() * remaining)
+            row = perm[j]
+            if not d1[row + col] and not d2[row - col + n - 1]:
+                perm[col], perm[j] = row, perm[col]
+                break
+        row = perm[col]
+        d1[row + col] = 1
+        d2[row - col + n - 1] = 1
+    return perm
+
+# Min-conflicts repair: take a random queen from the conflicted set and exchange its
+# row with the queen (among all columns on small boards, else `samples` random ones)
+# that removes the most attacking pairs. Every row already holds one queen, so
+# moving a single queen would only trade a diagonal conflict for a row conflict;
+# a swap is two O(1) moves that keep the rows a permutation. Queens in the set are
+# re-checked when picked, since moves elsewhere may have freed them. A run restarts
+# from a new greedy permutation after `patience` picks in a row without an improving
+# swap, or after max_steps repairs.
+# Returns (state, steps); state is None if every restart ran out.
+def min_conflicts(n=N, max_steps=None, seed=None, samples=64, max_restarts=50, patience=100):
+    rng = random.Random(seed)
+    if max_steps is None:
+        max_steps = 10 * n + 1000
+    steps = 0
+    for _ in range(max_restarts):
+        board, used = _repair(QueensBoard(greedy_permutation(n, rng)), rng, max_steps, samples, patience)
+        steps += used
+        if board is not None:
+            return board.state(), steps
+    return None, steps
+
+def _repair(board, rng, max_steps, samples, patience):
+    n = board.n
+    conflicted = [col for col in range(n) if board.queen_conflicts(col) > 0]
+    in_set = bytearray(n)
+    for col in conflicted:
+        in_set[col] = 1
+
+    rand = rng.random
+    all_cols = range(n) if n <= samples else None
+    steps = 0
+    stalled = 0
+    while conflicted and steps < max_steps and stalled < patience:
+        i = int(rand() * len(conflicted))
+        col = conflicted[i]
+        conflicted[i] = conflicted[-1]
+        conflicted.pop()
+        in_set[col] = 0
+        if board.queen_conflicts(col) == 0:
+            continue
+        steps += 1
+
+        best, best_cols = 0, []
+        for other in all_cols or [int(rand() * n) for _ in range(samples)]:
+            if other == col:
+                continue
+            d = board.swap_delta(col, other)
+            if d < best:
+                best, best_cols = d, [other]
+            elif d == best and d < 0:
+                best_cols.append(other)
+        touched = [col]
+        stalled += 1
+        if best_cols:
+            stalled = 0
+            other = best_cols[int(rand() * len(best_cols))]
+            touched += board.swap(col, other) + [other]
+        for queen in touched:
+            if not in_set[queen] and board.queen_conflicts(queen) > 0:
+                in_set[queen] = 1
+                conflicted.append(queen)
+    return (board if not conflicted else None), steps
+
+
+# Exact search with bitboards: rows are filled top to bottom and the columns and both
+# diagonals under attack are int bitmasks, shifted by one per row for the diagonals.
+# Solutions are returned in the same state format (state[col] = row).
+def _count_from(full, cols, left, right):
+    if cols == full:
+        return 1
+    count = 0
+    free = full & ~(cols | left | right)
+    while free:
+        bit = free & -free
+        free ^= bit
+        count += _count_from(full, cols | bit, (left | bit) << 1 & full, (right | bit) >> 1)
+    return count
+
+def _first_from(full, cols, left, right, placed):
+    if cols == full:
+        return placed
+    free = full & ~(cols | left | right)
+    while free:
+        bit = free & -free
+        free ^= bit
+        found = _first_from(full, cols | bit, (left | bit) << 1 & full, (right | bit) >> 1, placed + [bit])
+        if found is not None:
+            return found
+    return None
+
+# masks after placing the queens of `prefix` (column per row), or None if they attack
+def _place_prefix(n, prefix):
+    full = (1 << n) - 1
+    cols = left = right = 0
+    for col in prefix:
+        bit = 1 << col
+        if (cols | left | right) & bit:
+            return None
+        cols, left, right = cols | bit, (left | bit) << 1 & full, (right | bit) >> 1
+    return full, cols, left, right
+
+def _bits_to_state(bits):
+    state = [0] * len(bits)
+    for row, bit in enumerate(bits):
+        state[bit.bit_length() - 1] = row
+    return tuple(state)
+
+def _count_branch(task):
+    n, prefix, weight = task
+    masks = _place_prefix(n, prefix)
+    return weight * _count_from(*masks) if masks else 0
+
+def _first_branch(task):
+    n, prefix = task
+    masks = _place_prefix(n, prefix)
+    if masks is None:
+        return None
+    found = _first_from(*masks, [1 << col for col in prefix])
+    return _bits_to_state(found) if found else None
+
+# Mirror symmetry: a solution with the first-row queen in column c mirrors to one with
+# it in column n-1-c, so only the left half is searched and counted twice. For odd n
+# the middle column is split on the second row the same way.
+def _symmetric_branches(n):
+    half = n // 2
+    tasks = [(n, (c,), 2) for c in range(half)]
+    if n % 2:
+        tasks += [(n, (half, c), 2) for c in range(half)]
+    return tasks
+
+def count_solutions(n=N, processes=1):
+    if n == 1:
+        return 1
+    tasks = _symmetric_branches(n)
+    if processes == 1:
+        return sum(_count_branch(task) for task in tasks)
+    with mp.Pool(processes) as pool:
+        return sum(pool.imap_unordered(_count_branch, tasks))
+
+# First solution found; with a pool the first branch to finish wins and the rest are
+# cancelled, so the solution may differ from the sequential (leftmost) one
+def solve_bitboard(n=N, processes=1):
+    tasks = [(n, (c,)) for c in range((n + 1) // 2)]
+    if processes == 1:
+        for task in tasks:
+            state = _first_branch(task)
+            if state is not None:
+                return state
+        return None
+    with mp.Pool(processes) as pool:
+        for state in pool.imap_unordered(_first_branch, tasks):
+            if state is not None:
+                return state
+    return None
+
+
+if __name__ == "__main__":
+    path, solution, restarts = random_restart_hill_climb()
+
+    if solution:
+        print(f"Solved after {restarts} restarts!\n")
+        for state in path:
+            print(f"Conflicts: {conflicts(state)}")
+            print_board(state)
+    else:
+        print("Failed to solve within restart limit.")
+
+    for n in (8, 1000, 100000):
+        start = time.perf_counter()
+        state, steps = min_conflicts(n, seed=0)
+        elapsed = time.perf_counter() - start
+        print(f"Min-conflicts n={n}: {steps} repair steps, {elapsed:.3f}s, conflicts={conflicts(state)}")
+        if n == 8:
+            print_board(state)
+
+    solution = solve_bitboard(8)
+    print(f"Bitboard first solution, conflicts={conflicts(solution)}")
+    print_board(solution)
+    for n in (8, 10, 12):
+        start = time.perf_counter()
+        total = count_solutions(n, processes=None)
+        print(f"{n}-Queens: {total} solutions in {time.perf_counter() - start:.3f}s")
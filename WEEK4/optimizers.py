@@ -0,0 +1,355 @@
+import math
+import random
+import time
+
+from tsp import (Tour, apply_move, generate_distance_matrix, local_search, matrix_rows, neighbour_lists,
+                 or_opt_moves, tour_cost, two_opt_moves)
+
+# Pluggable TSP optimizers on top of the array-backed Tour in tsp.py.
+# Every optimizer has the signature
+#     optimizer(tour, dist, time_budget=..., seed=..., trace=None, neigh=None, **options) -> (tour, cost)
+# and appends (elapsed_seconds, best_cost) to trace whenever its best tour improves,
+# so runs of different optimizers can be compared by quality over time.
+
+OPTIMIZERS = {}
+
+def register_optimizer(name):
+    def wrap(optimizer):
+        OPTIMIZERS[name] = optimizer
+        return optimizer
+    return wrap
+
+def random_tour(n, seed=0):
+    tour = list(range(n))
+    random.Random(seed).shuffle(tour)
+    return tour
+
+# Best cost a trace had reached after `elapsed` seconds
+def best_at(trace, elapsed):
+    best = None
+    for t, cost in trace:
+        if t > elapsed:
+            break
+        best = cost
+    return best
+
+
+@register_optimizer("local_search")
+def descent(tour, dist, time_budget=None, seed=0, trace=None, neigh=None, k=10):
+    start = time.perf_counter()
+    if trace is not None:
+        trace.append((0.0, tour_cost(tour, dist)))
+    tour, cost = local_search(tour, dist, k=k, neigh=neigh)
+    if trace is not None:
+        trace.append((time.perf_counter() - start, cost))
+    return tour, cost
+
+
+# Cooling schedules map progress in [0, 1] (share of the step or time budget used)
+# to a temperature between t0 and t_end.
+def geometric_cooling(t0, t_end):
+    return lambda progress: t0 * (t_end / t0) ** progress
+
+def linear_cooling(t0, t_end):
+    return lambda progress: t0 + (t_end - t0) * progress
+
+def logarithmic_cooling(t0, t_end):
+    return lambda progress: t0 / (1 + (t0 / t_end - 1) * math.log1p(progress * (math.e - 1)))
+
+COOLING_SCHEDULES = {"geometric": geometric_cooling, "linear": linear_cooling, "logarithmic": logarithmic_cooling}
+
+# One random 2-opt or Or-opt move near a city and its cost delta, or None if the
+# sampled move is degenerate
+def random_move(t, dist, neigh, rng):
+    n = t.n
+    a = rng.randrange(n)
+    c = rng.choice(neigh[a])
+    if rng.random() < 0.5:
+        b, d = t.succ(a), t.succ(c)
+        if c == b or d == a:
+            return None
+        return dist[a][c] + dist[b][d] - dist[a][b] - dist[c][d], ("2opt", t.pos[b], t.pos[c])
+
+    # move the segment of 1..3 cities starting at a between c and its successor
+    length = rng.randint(1, 3)
+    start = t.pos[a]
+    s2 = t.order[(start + length - 1) % n]
+    x, y = c, t.succ(c)
+    if (t.pos[x] - start) % n < length or (t.pos[y] - start) % n < length:
+        return None
+    p, q = t.pred(a), t.succ(s2)
+    removed = dist[p][a] + dist[s2][q] + dist[x][y] - dist[p][q]
+    if rng.random() < 0.5:
+        return dist[x][a] + dist[s2][y] - removed, ("or", a, s2, x, y, False)
+    return dist[x][s2] + dist[a][y] - removed, ("or", a, s2, x, y, True)
+
+# Starting temperature that accepts an average uphill move about half of the time
+def initial_temperature(t, dist, neigh, rng, samples=200):
+    uphill = []
+    for _ in range(samples):
+        move = random_move(t, dist, neigh, rng)
+        if move is not None and move[0] > 0:
+            uphill.append(move[0])
+    return (sum(uphill) / len(uphill) if uphill else 1.0) / math.log(2)
+
+@register_optimizer("simulated_annealing")
+def simulated_annealing(tour, dist, time_budget=2.0, seed=0, trace=None, neigh=None, k=10, max_steps=None,
+                        schedule="geometric", t0=None, t_end=None):
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    t = Tour(tour)
+    if t.n < 8:
+        return descent(tour, dist, time_budget, seed, trace, neigh, k)
+    if neigh is None:
+        neigh = neighbour_lists(dist, k)
+    dist = matrix_rows(dist)
+    if t0 is None:
+        t0 = initial_temperature(t, dist, neigh, rng)
+    if t_end is None:
+        t_end = t0 * 1e-3
+    if not callable(schedule):
+        schedule = COOLING_SCHEDULES[schedule](t0, t_end)
+    if time_budget is None and max_steps is None:
+        max_steps = 100 * t.n
+
+    cost = tour_cost(t.order, dist)
+    best_cost, best_order = cost, t.order[:]
+    if trace is not None:
+        trace.append((0.0, best_cost))
+    temperature = t0
+    step = 0
+    while True:
+        # progress and temperature are refreshed every 256 steps
+        if step & 255 == 0:
+            elapsed = time.perf_counter() - start
+            progress = 0.0
+            if max_steps is not None:
+                progress = step / max_steps
+            if time_budget is not None:
+                progress = max(progress, elapsed / time_budget)
+            if progress >= 1.0:
+                break
+            temperature = schedule(progress)
+        step += 1
+        move = random_move(t, dist, neigh, rng)
+        if move is None:
+            continue
+        delta, move = move
+        if delta < 0 or rng.random() < math.exp(-delta / temperature):
+            apply_move(t, move)
+            cost += delta
+            if cost < best_cost - 1e-9:
+                best_cost, best_order = cost, t.order[:]
+                if trace is not None:
+                    trace.append((time.perf_counter() - start, best_cost))
+    return best_order, tour_cost(best_order, dist)
+
+
+def _edge(u, v):
+    return (u, v) if u < v else (v, u)
+
+# (removed, added) edges of a 2-opt or Or-opt move on the current tour
+def move_edges(t, move):
+    if move[0] == "2opt":
+        _, i, j = move
+        a, b = t.order[(i - 1) % t.n], t.order[i]
+        c, d = t.order[j], t.order[(j + 1) % t.n]
+        return (_edge(a, b), _edge(c, d)), (_edge(a, c), _edge(b, d))
+    _, s1, s2, x, y, reverse = move
+    p, q = t.pred(s1), t.succ(s2)
+    removed = (_edge(p, s1), _edge(s2, q), _edge(x, y))
+    if reverse:
+        return removed, (_edge(p, q), _edge(x, s2), _edge(s1, y))
+    return removed, (_edge(p, q), _edge(x, s1), _edge(s2, y))
+
+# Tabu search over sampled 2-opt/Or-opt neighbourhoods: the best admissible move is
+# taken even when it is uphill, and edges it removes may not be re-added for
+# `tenure` iterations unless that would give a new best tour (aspiration).
+@register_optimizer("tabu_search")
+def tabu_search(tour, dist, time_budget=2.0, seed=0, trace=None, neigh=None, k=10, max_iterations=None,
+                tenure=None, sample=20):
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    t = Tour(tour)
+    n = t.n
+    if n < 8:
+        return descent(tour, dist, time_budget, seed, trace, neigh, k)
+    if neigh is None:
+        neigh = neighbour_lists(dist, k)
+    dist = matrix_rows(dist)
+    if tenure is None:
+        tenure = min(20, n // 4)
+    if time_budget is None and max_iterations is None:
+        max_iterations = 10 * n
+
+    cost = tour_cost(t.order, dist)
+    best_cost, best_order = cost, t.order[:]
+    if trace is not None:
+        trace.append((0.0, best_cost))
+    tabu = {}
+    iteration = 0
+    while max_iterations is None or iteration < max_iterations:
+        if time_budget is not None and time.perf_counter() - start >= time_budget:
+            break
+        iteration += 1
+        best_delta, best_move, best_removed = math.inf, None, None
+        for a in rng.sample(range(n), min(sample, n)):
+            for generate in (two_opt_moves, or_opt_moves):
+                for delta, move in generate(t, dist, neigh, a):
+                    if delta >= best_delta:
+                        continue
+                    removed, added = move_edges(t, move)
+                    if cost + delta >= best_cost - 1e-9 and any(tabu.get(e, 0) >= iteration for e in added):
+                        continue
+                    best_delta, best_move, best_removed = delta, move, removed
+        if best_move is None:
+            continue
+        apply_move(t, best_move)
+        cost += best_delta
+        for e in best_removed:
+            tabu[e] = iteration + tenure
+        if cost < best_cost - 1e-9:
+            best_cost, best_order = cost, t.order[:]
+            if trace is not None:
+                trace.append((time.perf_counter() - start, best_cost))
+        if iteration % 1000 == 0:
+            tabu = {e: until for e, until in tabu.items() if until >= iteration}
+    return best_order, tour_cost(best_order, dist)
+
+
+# Lin-Kernighan-style chain from t1: repeatedly break the open edge (t1, t2),
+# link t2 to a near neighbour t3 and drop (t3, t4), as long as the running gain
+# stays positive. Each step is one reversal; the chain is rolled back to the
+# prefix with the largest closed-tour gain. Returns (gain, touched cities).
+def lk_move(t, dist, neigh, t1, depth=10):
+    for t2 in (t.succ(t1), t.pred(t1)):
+        gain = dist[t1][t2]
+        steps = []
+        added = set()
+        touched = [t1, t2]
+        best_gain, best_len = 1e-9, 0
+        cur = t2
+        while len(steps) < depth:
+            forward = t.succ(t1) == cur
+            choice, choice_gain = None, -math.inf
+            for t3 in neigh[cur]:
+                g1 = gain - dist[cur][t3]
+                if g1 <= 0:
+                    break
+                if t3 == t1:
+                    continue
+                t4 = t.pred(t3) if forward else t.succ(t3)
+                if t4 == cur or _edge(t3, t4) in added:
+                    continue
+                if g1 + dist[t3][t4] > choice_gain:
+                    choice, choice_gain = (t3, t4), g1 + dist[t3][t4]
+            if choice is None:
+                break
+            t3, t4 = choice
+            t.reverse_path(cur, t4, t1)
+            steps.append((cur, t4))
+            added.add(_edge(cur, t3))
+            touched += [t3, t4]
+            gain = choice_gain
+            if gain - dist[t4][t1] > best_gain:
+                best_gain, best_len = gain - dist[t4][t1], len(steps)
+            cur = t4
+        while len(steps) > best_len:
+            u, v = steps.pop()
+            t.reverse_path(u, v, t1)
+        if best_len:
+            return best_gain, touched
+    return 0.0, None
+
+# LK chains plus Or-opt segment insertion under don't-look bits; returns the total gain
+def _lk_descent(t, dist, neigh, cities, depth):
+    total = 0.0
+    queue = list(dict.fromkeys(cities))
+    queued = set(queue)
+    while queue:
+        a = queue.pop()
+        queued.discard(a)
+        gain, touched = lk_move(t, dist, neigh, a, depth)
+        if touched is None:
+            for delta, move in or_opt_moves(t, dist, neigh, a):
+                if delta < -1e-9:
+                    gain, touched = -delta, apply_move(t, move)
+                    break
+        if touched is None:
+            continue
+        total += gain
+        for c in touched + [a]:
+            if c not in queued:
+                queued.add(c)
+                queue.append(c)
+    return total
+
+# Or-3opt/LK-style improvement, iterated: after reaching a local optimum the tour is
+# perturbed with a double-bridge kick and re-optimised around the kick; the kick is
+# kept only if the result is better.
+@register_optimizer("or_3opt")
+def or_3opt(tour, dist, time_budget=2.0, seed=0, trace=None, neigh=None, k=10, depth=10, max_kicks=None):
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    t = Tour(tour)
+    n = t.n
+    if n < 8:
+        return descent(tour, dist, time_budget, seed, trace, neigh, k)
+    if neigh is None:
+        neigh = neighbour_lists(dist, k)
+    dist = matrix_rows(dist)
+    if trace is not None:
+        trace.append((0.0, tour_cost(t.order, dist)))
+
+    _lk_descent(t, dist, neigh, t.order, depth)
+    best_cost, best_order = tour_cost(t.order, dist), t.order[:]
+    if trace is not None:
+        trace.append((time.perf_counter() - start, best_cost))
+    if time_budget is None and max_kicks is None:
+        return best_order, best_cost
+
+    kicks = 0
+    while max_kicks is None or kicks < max_kicks:
+        if time_budget is not None and time.perf_counter() - start >= time_budget:
+            break
+        kicks += 1
+        i, j, l = sorted(rng.sample(range(1, n), 3))
+        order = best_order
+        t = Tour(order[:i] + order[j:l] + order[i:j] + order[l:])
+        ends = [order[i - 1], order[i], order[j - 1], order[j], order[l - 1], order[l % n]]
+        _lk_descent(t, dist, neigh, ends, depth)
+        cost = tour_cost(t.order, dist)
+        if cost < best_cost - 1e-9:
+            best_cost, best_order = cost, t.order[:]
+            if trace is not None:
+                trace.append((time.perf_counter() - start, best_cost))
+    return best_order, best_cost
+
+
+# Runs every optimizer from the same seeded start tour with the same budget
+def compare_optimizers(dist, names=None, time_budget=2.0, seed=0, k=10):
+    neigh = neighbour_lists(dist, k)
+    start_tour = random_tour(len(dist), seed)
+    results = {}
+    for name in names or OPTIMIZERS:
+        trace = []
+        t0 = time.perf_counter()
+        tour, cost = OPTIMIZERS[name](start_tour, dist, time_budget=time_budget, seed=seed, trace=trace,
+                                      neigh=neigh, k=k)
+        results[name] = {"tour": tour, "cost": cost, "time": time.perf_counter() - t0, "trace": trace}
+    return results
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    n = 300
+    dist_matrix = generate_distance_matrix(n, max_dist=100)
+    budget = 3.0
+    checkpoints = [0.1, 0.5, 1.0, 2.0, budget]
+
+    results = compare_optimizers(dist_matrix, time_budget=budget)
+    print(f"{n} cities, {budget}s per optimizer; best cost after t seconds")
+    print("%-20s" % "optimizer" + "".join("%10s" % ("%.1fs" % c) for c in checkpoints))
+    for name, result in results.items():
+        row = "".join("%10s" % best_at(result["trace"], c) for c in checkpoints)
+        print("%-20s%s" % (name, row))
@@ -1,4 +1,13 @@
+import heapq
+import math
+import multiprocessing as mp
 import random
+import time
+from array import array
+from collections import deque
+from multiprocessing import shared_memory
+
+import numpy as np
 
 def generate_distance_matrix(n, max_dist=10):
     dist = [[0]*n for _ in range(n)]
@@ -9,6 +18,12 @@ def generate_distance_matrix(n, max_dist=10):
     return dist
 
 def tour_cost(tour, dist):
+    if isinstance(dist, LazyDistances):
+        tour = np.asarray(tour)
+        return dist.pair_distances(tour, np.roll(tour, -1)).sum().item()
+    if isinstance(dist, np.ndarray):
+        tour = np.asarray(tour)
+        return dist[tour, np.roll(tour, -1)].sum().item()
     cost = 0
     for i in range(len(tour)):
         cost += dist[tour[i]][tour[(i + 1) % len(tour)]]
@@ -51,14 +66,545 @@ def random_restart_hill_climb(dist, num_restarts=50):
     return best_overall, best_cost
 
 
-n = 6  
-dist_matrix = generate_distance_matrix(n, max_dist=20)
+# Coordinate instances. Distances follow the TSPLIB edge weight types; "euclidean"
+# keeps exact floats. Dense matrices are built in row blocks with NumPy, and the
+# integer TSPLIB metrics default to int32 so a 10k-city matrix takes 400 MB.
+# Above LAZY_THRESHOLD cities no matrix is built at all (see LazyDistances).
+LAZY_THRESHOLD = 5000
+INTEGER_METRICS = ("EUC_2D", "CEIL_2D", "ATT", "GEO")
+
+def _geo_radians(v):
+    # TSPLIB GEO coordinates are DDD.MM (degrees and minutes)
+    deg = np.trunc(v)
+    return 3.141592 * (deg + 5.0 * (v - deg) / 3.0) / 180.0
+
+# Vectorized distances between coordinate arrays a and b (shape (..., 2), broadcast)
+def pair_distances(a, b, metric="euclidean"):
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    if metric == "GEO":
+        lat_a, lon_a = _geo_radians(a[..., 0]), _geo_radians(a[..., 1])
+        lat_b, lon_b = _geo_radians(b[..., 0]), _geo_radians(b[..., 1])
+        q1 = np.cos(lon_a - lon_b)
+        q2 = np.cos(lat_a - lat_b)
+        q3 = np.cos(lat_a + lat_b)
+        cos = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+        return np.floor(6378.388 * np.arccos(cos) + 1.0)
+    d = np.hypot(a[..., 0] - b[..., 0], a[..., 1] - b[..., 1])
+    if metric == "euclidean":
+        return d
+    if metric == "EUC_2D":
+        return np.floor(d + 0.5)
+    if metric == "CEIL_2D":
+        return np.ceil(d)
+    if metric == "ATT":
+        r = d / math.sqrt(10.0)
+        t = np.floor(r + 0.5)
+        return t + (t < r)
+    raise ValueError("Unsupported metric %r" % metric)
+
+# Scalar version for lazy lookups; plain math is much faster than NumPy on two points
+def point_distance(p, q, metric="euclidean"):
+    if metric == "GEO":
+        return pair_distances(p, q, metric).item()
+    d = math.hypot(p[0] - q[0], p[1] - q[1])
+    if metric == "euclidean":
+        return d
+    if metric == "EUC_2D":
+        return int(d + 0.5)
+    if metric == "CEIL_2D":
+        return math.ceil(d)
+    if metric == "ATT":
+        r = d / math.sqrt(10.0)
+        t = int(r + 0.5)
+        return t + 1 if t < r else t
+    raise ValueError("Unsupported metric %r" % metric)
+
+def distance_matrix(coords, metric="euclidean", dtype=None, block=1024):
+    coords = np.asarray(coords, dtype=np.float64)
+    n = len(coords)
+    if dtype is None:
+        dtype = np.int32 if metric in INTEGER_METRICS else np.float64
+    out = np.empty((n, n), dtype=dtype)
+    for start in range(0, n, block):
+        out[start:start + block] = pair_distances(coords[start:start + block, None, :], coords[None, :, :], metric)
+    return out
+
+def random_coordinates(n, seed=None, scale=1000.0):
+    return np.random.default_rng(seed).uniform(0.0, scale, size=(n, 2))
+
+# Cities in Hilbert-curve order: a cheap start tour for large coordinate instances,
+# since local search from a random tour spends most of its time on long reversals
+def space_filling_tour(coords, bits=16):
+    coords = np.asarray(coords, dtype=np.float64)
+    side = 1 << bits
+    lo = coords.min(axis=0)
+    span = float((coords.max(axis=0) - lo).max()) or 1.0
+    x, y = np.minimum(((coords - lo) / span * side).astype(np.int64), side - 1).T
+    d = np.zeros(len(coords), dtype=np.int64)
+    s = side >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+        flip = ~ry & rx
+        x = np.where(flip, side - 1 - x, x)
+        y = np.where(flip, side - 1 - y, y)
+        x, y = np.where(ry, x, y), np.where(ry, y, x)
+        s >>= 1
+    return np.argsort(d, kind="stable").tolist()
+
+# NODE_COORD_SECTION instances; returns (coords, metric)
+def read_tsplib(path):
+    spec = {}
+    coords = []
+    in_coords = False
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line == "EOF":
+                break
+            if in_coords:
+                parts = line.split()
+                if len(parts) >= 3 and not parts[0][0].isalpha():
+                    coords.append((float(parts[1]), float(parts[2])))
+                    continue
+                in_coords = False
+            if line.upper().startswith("NODE_COORD_SECTION"):
+                in_coords = True
+            elif ":" in line:
+                key, value = line.split(":", 1)
+                spec[key.strip().upper()] = value.strip()
+    metric = spec.get("EDGE_WEIGHT_TYPE", "EUC_2D").upper()
+    if metric not in INTEGER_METRICS:
+        raise ValueError("Unsupported EDGE_WEIGHT_TYPE %s" % metric)
+    if not coords:
+        raise ValueError("%s has no NODE_COORD_SECTION" % path)
+    return np.array(coords), metric
+
+# Returns a dense matrix, or LazyDistances for large instances (lazy=None decides by size)
+def load_instance(source, metric=None, lazy=None, k=10, dtype=None):
+    if isinstance(source, str):
+        coords, file_metric = read_tsplib(source)
+        metric = metric or file_metric
+    else:
+        coords = np.asarray(source, dtype=np.float64)
+    metric = metric or "euclidean"
+    if lazy is None:
+        lazy = len(coords) > LAZY_THRESHOLD
+    if lazy:
+        return LazyDistances(coords, metric, k)
+    return distance_matrix(coords, metric, dtype)
+
+# k nearest neighbours by coordinates: a KD-tree when SciPy is installed, else a uniform grid
+def nearest_neighbours(coords, k):
+    coords = np.asarray(coords, dtype=np.float64)
+    n = len(coords)
+    k = min(k, n - 1)
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:
+        return _grid_neighbours(coords, k)
+    _, idx = cKDTree(coords).query(coords, k + 1)
+    return [[j for j in row if j != a][:k] for a, row in enumerate(idx.tolist())]
+
+def _grid_neighbours(coords, k):
+    n = len(coords)
+    lo = coords.min(axis=0)
+    span = float((coords.max(axis=0) - lo).max()) or 1.0
+    side = max(1, int(math.sqrt(n / 2.0)))
+    cell = span / side
+    cells = np.minimum(((coords - lo) / cell).astype(np.int64), side - 1)
+    buckets = {}
+    for i, (cx, cy) in enumerate(cells.tolist()):
+        buckets.setdefault((cx, cy), []).append(i)
+
+    neighbours = []
+    for a, (cx, cy) in enumerate(cells.tolist()):
+        found = []
+        r = 0
+        while True:
+            # ring r of cells around a's cell
+            for x in range(cx - r, cx + r + 1):
+                for y in range(cy - r, cy + r + 1):
+                    if max(abs(x - cx), abs(y - cy)) == r:
+                        found.extend(buckets.get((x, y), ()))
+            # every point within r * cell of a has now been seen
+            if len(found) > k:
+                d = np.hypot(*(coords[found] - coords[a]).T)
+                order = np.argsort(d, kind="stable")
+                if d[order[k]] <= r * cell or r > side:
+                    break
+            elif r > side:
+                d = np.hypot(*(coords[found] - coords[a]).T)
+                order = np.argsort(d, kind="stable")
+                break
+            r += 1
+        neighbours.append([j for j in np.asarray(found)[order].tolist() if j != a][:k])
+    return neighbours
+
+
+class _LazyRow:
+    __slots__ = ("owner", "a", "cached")
+
+    def __init__(self, owner, a):
+        self.owner = owner
+        self.a = a
+        self.cached = {}
+
+    def __getitem__(self, b):
+        d = self.cached.get(b)
+        if d is None:
+            owner = self.owner
+            d = point_distance(owner.points[self.a], owner.points[b], owner.metric)
+        return d
+
+# Distance "matrix" computed on demand from coordinates. dist[a][b] works like a
+# nested list; distances to each city's candidate neighbours are cached.
+class LazyDistances:
+    def __init__(self, coords, metric="euclidean", k=10):
+        self.coords = np.asarray(coords, dtype=np.float64)
+        self.points = self.coords.tolist()
+        self.metric = metric
+        self.rows = [_LazyRow(self, a) for a in range(len(self.points))]
+        self.neighbours = None
+        self.k = k
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, a):
+        return self.rows[a]
+
+    def pair_distances(self, a, b):
+        d = pair_distances(self.coords[a], self.coords[b], self.metric)
+        return d.astype(np.int64) if self.metric in INTEGER_METRICS else d
+
+    # k nearest candidates per city, sorted by the instance metric; fills the cache
+    def candidates(self, k=None):
+        k = k or self.k
+        if self.neighbours is None or len(self.neighbours[0]) < min(k, len(self) - 1):
+            near = nearest_neighbours(self.coords, k)
+            width = min(k, len(self) - 1)
+            a = np.repeat(np.arange(len(self)), width)
+            d = self.pair_distances(a, np.asarray(near).ravel()).reshape(len(self), width).tolist()
+            self.neighbours = []
+            for row, nbrs, dists in zip(self.rows, near, d):
+                pairs = sorted(zip(dists, nbrs))
+                row.cached = {j: dj for dj, j in pairs}
+                self.neighbours.append([j for _, j in pairs])
+        return [nbrs[:k] for nbrs in self.neighbours]
+
+# Row views that local search can index like nested lists without NumPy scalar overhead
+def matrix_rows(dist):
+    if isinstance(dist, np.ndarray):
+        return [memoryview(row) for row in np.ascontiguousarray(dist)]
+    return dist
+
+
+# Array-backed tour: order[i] is the city at position i, pos[c] the position of city c
+class Tour:
+    def __init__(self, order):
+        self.order = list(order)
+        self.n = len(self.order)
+        self.pos = [0] * self.n
+        for i, c in enumerate(self.order):
+            self.pos[c] = i
+
+    def succ(self, c):
+        return self.order[(self.pos[c] + 1) % self.n]
+
+    def pred(self, c):
+        return self.order[(self.pos[c] - 1) % self.n]
+
+    # reverse positions i..j (cyclic); flipping the complement gives the same cycle,
+    # so the shorter side is the one that gets reversed
+    def reverse(self, i, j):
+        n = self.n
+        inner = (j - i) % n + 1
+        if 2 * inner > n:
+            i, j = (j + 1) % n, (i - 1) % n
+            inner = n - inner
+        order, pos = self.order, self.pos
+        for _ in range(inner // 2):
+            a, b = order[i], order[j]
+            order[i], order[j] = b, a
+            pos[a], pos[b] = j, i
+            i = (i + 1) % n
+            j = (j - 1) % n
+
+    # reverse the stretch between cities u and v that does not contain avoid
+    def reverse_path(self, u, v, avoid):
+        n, pos = self.n, self.pos
+        if (pos[avoid] - pos[u]) % n <= (pos[v] - pos[u]) % n:
+            self.reverse(pos[v], pos[u])
+        else:
+            self.reverse(pos[u], pos[v])
+
+    def swap(self, u, v):
+        order, pos = self.order, self.pos
+        pu, pv = pos[u], pos[v]
+        order[pu], order[pv] = v, u
+        pos[u], pos[v] = pv, pu
+
+    def cost(self, dist):
+        return tour_cost(self.order, dist)
+
+# k nearest other cities of every city, closest first
+def neighbour_lists(dist, k=10):
+    n = len(dist)
+    k = min(k, n - 1)
+    if isinstance(dist, LazyDistances):
+        return dist.candidates(k)
+    if isinstance(dist, np.ndarray):
+        neighbours = []
+        for start in range(0, n, 1024):
+            rows = dist[start:start + 1024]
+            idx = np.argpartition(rows, min(k, n - 1), axis=1)[:, :k + 1]
+            for a, cand in enumerate(idx.tolist(), start):
+                cand = sorted((c for c in cand if c != a), key=lambda c: dist[a, c])
+                neighbours.append(cand[:k])
+        return neighbours
+    return [heapq.nsmallest(k, (c for c in range(n) if c != a), key=dist[a].__getitem__) for a in range(n)]
+
+# Candidate moves around city a as (delta, move) pairs, move = (kind, args...)
+def two_opt_moves(t, dist, neigh, a):
+    # a -> b replaced by a -> c with c taken from a's neighbour list, both tour directions
+    for forward in (True, False):
+        b = t.succ(a) if forward else t.pred(a)
+        d_ab = dist[a][b]
+        for c in neigh[a]:
+            d_ac = dist[a][c]
+            if d_ac >= d_ab:
+                break
+            d = t.succ(c) if forward else t.pred(c)
+            if c == b or d == a:
+                continue
+            delta = d_ac + dist[b][d] - d_ab - dist[c][d]
+            if forward:
+                yield delta, ("2opt", t.pos[b], t.pos[c])
+            else:
+                yield delta, ("2opt", t.pos[a], t.pos[d])
+
+def or_opt_moves(t, dist, neigh, a, max_len=3):
+    # move the segment of 1..max_len cities starting at a between another pair x -> y
+    n = t.n
+    for length in range(1, min(max_len, n - 3) + 1):
+        s1 = a
+        s2 = t.order[(t.pos[a] + length - 1) % n]
+        p, q = t.pred(s1), t.succ(s2)
+        removed = dist[p][s1] + dist[s2][q] - dist[p][q]
+        segment = {t.order[(t.pos[a] + i) % n] for i in range(length)}
+        for c in neigh[s1] + neigh[s2]:
+            if c in segment:
+                continue
+            for x, y in ((c, t.succ(c)), (t.pred(c), c)):
+                if x in segment or y in segment:
+                    continue
+                d_xy = dist[x][y]
+                yield dist[x][s1] + dist[s2][y] - d_xy - removed, ("or", s1, s2, x, y, False)
+                yield dist[x][s2] + dist[s1][y] - d_xy - removed, ("or", s1, s2, x, y, True)
+
+def swap_moves(t, dist, neigh, u):
+    for v in neigh[u]:
+        a, b = t.pred(u), t.succ(u)
+        c, e = t.pred(v), t.succ(v)
+        if b == v:
+            delta = dist[a][v] + dist[u][e] - dist[a][u] - dist[v][e]
+        elif e == u:
+            delta = dist[c][u] + dist[v][b] - dist[c][v] - dist[u][b]
+        else:
+            delta = (dist[a][v] + dist[v][b] + dist[c][u] + dist[u][e]
+                     - dist[a][u] - dist[u][b] - dist[c][v] - dist[v][e])
+        yield delta, ("swap", u, v)
+
+MOVE_GENERATORS = {"2opt": two_opt_moves, "oropt": or_opt_moves, "swap": swap_moves}
+
+# applies a move in place and returns the cities whose tour edges changed
+def apply_move(t, move):
+    kind = move[0]
+    if kind == "2opt":
+        _, i, j = move
+        touched = [t.order[i], t.order[j], t.order[(i - 1) % t.n], t.order[(j + 1) % t.n]]
+        t.reverse(i, j)
+        return touched
+    if kind == "or":
+        # p s1..s2 q ... x y  ->  p q ... x s2..s1 y, then flip the segment if needed
+        _, s1, s2, x, y, reverse = move
+        p, q = t.pred(s1), t.succ(s2)
+        t.reverse_path(s1, x, p)
+        t.reverse_path(x, q, s1)
+        if not reverse:
+            t.reverse_path(s1, s2, x)
+        return [p, q, x, y, s1, s2]
+    _, u, v = move
+    touched = [u, v, t.pred(u), t.succ(u), t.pred(v), t.succ(v)]
+    t.swap(u, v)
+    return touched
+
+# Neighbour-list local search with don't-look bits: a city is only re-examined after
+# one of its tour edges changed. Every move is scored by its O(1) cost delta.
+def local_search(tour, dist, k=10, moves=("2opt", "oropt", "swap"), best_improvement=False, neigh=None, stats=None):
+    n = len(tour)
+    if n < 5:
+        if stats is not None:
+            stats.append(0)
+        return list(tour), tour_cost(tour, dist)
+    t = tour if isinstance(tour, Tour) else Tour(tour)
+    if neigh is None:
+        neigh = neighbour_lists(dist, k)
+    dist = matrix_rows(dist)
+    generators = [MOVE_GENERATORS[m] for m in moves]
+    queue = deque(t.order)
+    in_queue = bytearray(n)
+    for c in queue:
+        in_queue[c] = 1
+    evaluations = 0
+
+    while queue:
+        a = queue.popleft()
+        in_queue[a] = 0
+        best_delta, best_move = -1e-9, None
+        for generate in generators:
+            for delta, move in generate(t, dist, neigh, a):
+                evaluations += 1
+                if delta < best_delta:
+                    best_delta, best_move = delta, move
+                    if not best_improvement:
+                        break
+            if best_move is not None and not best_improvement:
+                break
+        if best_move is None:
+            continue
+        for c in apply_move(t, best_move) + [a]:
+            if not in_queue[c]:
+                in_queue[c] = 1
+                queue.append(c)
+    if stats is not None:
+        stats.append(evaluations)
+    return t.order, tour_cost(t.order, dist)
+
+
+# Parallel random restarts. The distance matrix lives in one shared-memory block in its
+# own dtype (int32 for the integer TSPLIB metrics, so costs stay ints as in tour_cost);
+# every worker reads it through row memoryviews, so nothing n*n is pickled.
+# Worker w runs restarts w, w + workers, ... and restart i always starts from the
+# tour shuffled with seed (seed, i), so a restart or evaluation budget gives the same
+# result for the same seed and worker count. A wall-clock budget only bounds the run.
+_restart_shared = {}
+
+def _attach_restart_worker(name, n, typecode, neigh, best, results):
+    block = shared_memory.SharedMemory(name=name)
+    flat = block.buf.cast(typecode)
+    _restart_shared["block"] = block
+    _restart_shared["dist"] = [flat[i * n:(i + 1) * n] for i in range(n)]
+    _restart_shared["neigh"] = neigh
+    _restart_shared["best"] = best
+    _restart_shared["results"] = results
+
+def _restart_worker(task):
+    worker, workers, seed, deadline, max_evaluations, max_restarts, moves = task
+    dist, neigh = _restart_shared["dist"], _restart_shared["neigh"]
+    best, results = _restart_shared["best"], _restart_shared["results"]
+    n = len(dist)
+    evaluations = 0
+    restart = worker
+    try:
+        while ((max_restarts is None or restart < max_restarts)
+               and (max_evaluations is None or evaluations < max_evaluations)
+               and (deadline is None or time.time() < deadline)):
+            order = list(range(n))
+            random.Random(seed * 1000003 + restart).shuffle(order)
+            stats = []
+            tour, cost = local_search(order, dist, moves=moves, neigh=neigh, stats=stats)
+            evaluations += stats[0]
+            # only tours at least as good as the shared best are sent back
+            with best.get_lock():
+                report = cost <= best.value
+                if report:
+                    best.value = cost
+            if report:
+                results.put((cost, restart, tour))
+            restart += workers
+    finally:
+        results.put(None)
+
+# Yields (tour, cost, restart, elapsed) each time a better tour arrives; the last one
+# is the best. Ties go to the lower restart index. max_evaluations counts evaluated
+# move deltas and is split evenly over the workers.
+def parallel_restarts(dist, workers=None, seed=0, time_budget=None, max_evaluations=None, max_restarts=None,
+                      moves=("2opt", "oropt", "swap"), k=10):
+    if time_budget is None and max_evaluations is None and max_restarts is None:
+        max_restarts = 50
+    workers = workers or mp.cpu_count()
+    n = len(dist)
+    start = time.perf_counter()
+    deadline = time.time() + time_budget if time_budget is not None else None
+    per_worker = -(-max_evaluations // workers) if max_evaluations is not None else None
+
+    if isinstance(dist, np.ndarray):
+        dtype = dist.dtype if dist.dtype.kind in "iuf" else np.dtype(np.float64)
+    elif all(isinstance(d, (int, np.integer)) for row in dist for d in row):
+        dtype = np.dtype(np.int64)
+    else:
+        dtype = np.dtype(np.float64)
+    block = shared_memory.SharedMemory(create=True, size=max(n * n * dtype.itemsize, 1))
+    flat = block.buf.cast(dtype.char)
+    try:
+        if isinstance(dist, np.ndarray):
+            np.frombuffer(flat, dtype=dtype)[:] = dist.ravel()
+        else:
+            for i, row in enumerate(dist):
+                flat[i * n:(i + 1) * n] = array(dtype.char, row)
+        neigh = neighbour_lists(dist, k)
+        best = mp.Value('d', float("inf"))
+        results = mp.Queue()
+        tasks = [(w, workers, seed, deadline, per_worker, max_restarts, moves) for w in range(workers)]
+        with mp.Pool(workers, initializer=_attach_restart_worker,
+                     initargs=(block.name, n, dtype.char, neigh, best, results)) as pool:
+            pending = pool.map_async(_restart_worker, tasks)
+            finished = 0
+            best_key = None
+            while finished < workers:
+                item = results.get()
+                if item is None:
+                    finished += 1
+                    continue
+                cost, restart, tour = item
+                if best_key is None or (cost, restart) < best_key:
+                    best_key = (cost, restart)
+                    yield tour, cost, restart, time.perf_counter() - start
+            pending.get()
+    finally:
+        flat.release()
+        block.close()
+        block.unlink()
+
+
+if __name__ == "__main__":
+    n = 6  
+    dist_matrix = generate_distance_matrix(n, max_dist=20)
+
+    best_tour, best_cost = random_restart_hill_climb(dist_matrix, num_restarts=100)
+
+    print("Distance Matrix:")
+    for row in dist_matrix:
+        print(row)
+
+    print("\nBest tour found:", best_tour + [best_tour[0]])
+    print("Tour cost:", best_cost)
 
-best_tour, best_cost = random_restart_hill_climb(dist_matrix, num_restarts=100)
+    ls_tour, ls_cost = local_search(list(range(n)), dist_matrix)
+    print("\nLocal search tour:", ls_tour + [ls_tour[0]])
+    print("Tour cost:", ls_cost)
 
-print("Distance Matrix:")
-for row in dist_matrix:
-    print(row)
+    coords = random_coordinates(2000, seed=0)
+    dist = load_instance(coords, metric="EUC_2D")
+    tour, cost = local_search(space_filling_tour(coords), dist)
+    print("\n2000 random cities (EUC_2D): local search cost", cost, "=", tour_cost(np.array(tour), dist))
 
-print("\nBest tour found:", best_tour + [best_tour[0]])
-print("Tour cost:", best_cost)
\ No newline at end of file
+    print("\nParallel restarts:")
+    for tour, cost, restart, elapsed in parallel_restarts(dist_matrix, workers=4, max_restarts=20):
+        print(f"  restart {restart}: cost {cost} after {elapsed:.3f}s")
@@ -1,5 +1,7 @@
-import time, tracemalloc, pandas as pd, sys
-sys.setrecursionlimit(100000)
+import time, tracemalloc, pandas as pd, heapq, math, os, pickle, random, sys
+import multiprocessing as mp
+import numpy as np
+from collections import deque
 
 
 def planar_graph(n):
@@ -27,14 +29,284 @@ def planar_graph(n):
     return adj, n, edges
 
 
+# Generators below build edge lists as numpy arrays and convert them to the same
+# (adj, n, edges) triple as planar_graph in a single pass.
+def edges_to_adj(n, u, v):
+    src = np.concatenate([u, v])
+    order = np.argsort(src, kind="stable")
+    dst = np.concatenate([v, u])[order].tolist()
+    bounds = np.searchsorted(src[order], np.arange(n + 1)).tolist()
+    adj = {i: set(dst[bounds[i]:bounds[i + 1]]) for i in range(n)}
+    return adj, n, sum(len(nb) for nb in adj.values()) // 2
 
+# Random maximal planar graph (Apollonian network): each new vertex x goes inside a
+# random triangular face and splits it into three. 3n-6 edges, 4-colourable.
+# Face slots: 0 and 1 are both sides of the outer triangle; vertex x overwrites the
+# slot it picked with (a, b, x) and appends (b, c, x), (a, c, x) as slots 2x-4, 2x-3.
+# The face x splits is the last write to its slot before x, so sorting all writes by
+# (slot, vertex) gives every vertex its parent write, and the faces are resolved one
+# level of that tree at a time.
+def triangulated_planar_graph(n, seed=0):
+    rng = np.random.default_rng(seed)
+    if n < 4:
+        u, v = np.triu_indices(n, 1)
+        return edges_to_adj(n, u, v)
+    picks = rng.random(n)
+    x = np.arange(3, n, dtype=np.int64)
+    slot = (picks[3:] * (2 * x - 4)).astype(np.int64)
+
+    # writes as (slot, vertex, kind): kind 0 = (a, b, x), 1 = (b, c, x), 2 = (a, c, x),
+    # 3 = the outer triangle, written "before" vertex 3
+    w_slot = np.concatenate([[0, 1], slot, 2 * x - 4, 2 * x - 3])
+    w_vertex = np.concatenate([[2, 2], x, x, x])
+    w_kind = np.concatenate([[3, 3], np.zeros_like(x), np.ones_like(x), np.full_like(x, 2)])
+    order = np.lexsort((w_vertex, w_slot))
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.size)
+    parent = order[rank[2:2 + x.size] - 1]  # write just before x's own overwrite
+    p_vertex, p_kind = w_vertex[parent] - 3, w_kind[parent]
+
+    faces = np.empty((x.size, 3), dtype=np.int64)
+    done = p_kind == 3
+    faces[done] = (0, 1, 2)
+    pick = np.array([[0, 1], [1, 2], [0, 2]])
+    while not done.all():
+        ready = ~done & done[np.maximum(p_vertex, 0)]
+        src = faces[p_vertex[ready]]
+        cols = pick[p_kind[ready]]
+        faces[ready, 0] = np.take_along_axis(src, cols[:, :1], 1)[:, 0]
+        faces[ready, 1] = np.take_along_axis(src, cols[:, 1:], 1)[:, 0]
+        faces[ready, 2] = p_vertex[ready] + 3
+        done |= ready
+
+    u = np.concatenate([[0, 0, 1], np.repeat(x, 3)])
+    v = np.concatenate([[1, 2, 2], faces.ravel()])
+    return edges_to_adj(n, u, v)
+
+# Cycle 0-1-...-(n-1)-0 plus `chords` random chords (n // 4 by default)
+def ring_graph(n, chords=None, seed=0):
+    rng = np.random.default_rng(seed)
+    if chords is None:
+        chords = n // 4
+    u = np.arange(n, dtype=np.int64)
+    v = (u + 1) % n
+    if n < 3:
+        u, v = u[:n - 1], v[:n - 1]
+    a = rng.integers(0, max(n, 1), size=chords)
+    b = rng.integers(0, max(n, 1), size=chords)
+    keep = a != b
+    return edges_to_adj(n, np.concatenate([u, a[keep]]), np.concatenate([v, b[keep]]))
+
+# rows x cols lattice; with diagonals every cell gets one diagonal, giving a
+# triangulated (still planar, 3-colourable) grid
+def grid_graph(rows, cols=None, diagonals=False):
+    cols = cols or rows
+    idx = np.arange(rows * cols).reshape(rows, cols)
+    u = [idx[:, :-1].ravel(), idx[:-1, :].ravel()]
+    v = [idx[:, 1:].ravel(), idx[1:, :].ravel()]
+    if diagonals:
+        u.append(idx[:-1, :-1].ravel())
+        v.append(idx[1:, 1:].ravel())
+    return edges_to_adj(rows * cols, np.concatenate(u), np.concatenate(v))
+
+# n random points in the unit square joined when closer than radius (by default the
+# radius giving about `degree` neighbours). Points are sorted by x and compared a
+# block at a time against the window of points within radius to the right.
+def random_geometric_graph(n, radius=None, seed=0, degree=6, block=128):
+    rng = np.random.default_rng(seed)
+    if radius is None:
+        radius = math.sqrt(degree / (math.pi * n))
+    x, y = rng.random((2, n))
+    order = np.argsort(x)
+    x, y = x[order], y[order]
+    end = np.searchsorted(x, x + radius, side="right")
+    us, vs = [], []
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        dx = x[start:stop, None] - x[None, start:end[stop - 1]]
+        dy = y[start:stop, None] - y[None, start:end[stop - 1]]
+        i, j = np.nonzero(dx * dx + dy * dy <= radius * radius)
+        i += start
+        j += start
+        keep = j > i
+        us.append(order[i[keep]])
+        vs.append(order[j[keep]])
+    return edges_to_adj(n, np.concatenate(us), np.concatenate(vs))
+
+# DIMACS benchmark families
+
+# G(n, p) as in the DSJCn.p instances: the edge count is drawn from the binomial and
+# that many distinct vertex pairs are decoded from their index in the upper triangle
+def random_graph(n, p, seed=0):
+    rng = np.random.default_rng(seed)
+    pairs = n * (n - 1) // 2
+    picks = rng.choice(pairs, rng.binomial(pairs, p), replace=False)
+    # pair index k -> (i, j), i < j, counting pairs row by row
+    i = (2 * n - 1 - np.sqrt((2 * n - 1) ** 2 - 8 * picks.astype(np.float64))) // 2
+    i = i.astype(np.int64)
+    i -= (i * (2 * n - i - 1) // 2 > picks)
+    i += ((i + 1) * (2 * n - i - 2) // 2 <= picks)
+    j = picks - i * (2 * n - i - 1) // 2 + i + 1
+    return edges_to_adj(n, i, j)
+
+# queenN_N: squares of an n x n board, adjacent when a queen attacks between them
+def queen_graph(n):
+    r, c = np.divmod(np.arange(n * n), n)
+    u, v = np.triu_indices(n * n, 1)
+    attack = (r[u] == r[v]) | (c[u] == c[v]) | (np.abs(r[u] - r[v]) == np.abs(c[u] - c[v]))
+    return edges_to_adj(n * n, u[attack], v[attack])
+
+# mycielK: triangle-free with chromatic number K+1 (myciel3 has 11 vertices). Each
+# step adds a shadow u' of every vertex u, joined to u's neighbours, and a hub
+# joined to all shadows.
+def mycielski_graph(k):
+    n, u, v = 2, np.array([0]), np.array([1])
+    for _ in range(k - 1):
+        shadow = np.arange(n, 2 * n)
+        u, v = (np.concatenate([u, u + n, v + n, shadow]),
+                np.concatenate([v, v, u, np.full(n, 2 * n)]))
+        n = 2 * n + 1
+    return edges_to_adj(n, u, v)
+
+
+# DIMACS .col files ("p edge n m" then "e u v" lines, vertices numbered from 1) are
+# read line by line straight into the neighbour sets. Returns (adj, n, edges) with
+# vertices 0..n-1, like the generators; malformed files raise ValueError.
+def read_dimacs(path):
+    adj = None
+    with open(path) as f:
+        for lineno, line in enumerate(f, 1):
+            if line.startswith("e"):
+                if adj is None:
+                    raise ValueError("%s:%d: edge line before the 'p edge' line" % (path, lineno))
+                try:
+                    _, a, b = line.split()
+                    a, b = int(a) - 1, int(b) - 1
+                    if not (0 <= a < n and 0 <= b < n):
+                        raise ValueError
+                except ValueError:
+                    raise ValueError("%s:%d: bad edge line %r" % (path, lineno, line.strip())) from None
+                adj[a].add(b)
+                adj[b].add(a)
+            elif line.startswith("p"):
+                if adj is not None:
+                    raise ValueError("%s:%d: second 'p edge' line" % (path, lineno))
+                try:
+                    n = int(line.split()[2])
+                except (IndexError, ValueError):
+                    raise ValueError("%s:%d: bad problem line %r" % (path, lineno, line.strip())) from None
+                adj = {i: set() for i in range(n)}
+    if adj is None:
+        raise ValueError("%s: no 'p edge n m' line" % path)
+    return adj, n, sum(len(nb) for nb in adj.values()) // 2
+
+# A k-colouring CSP over a .col file that takes over the neighbour sets read_dimacs
+# built instead of copying them
+def read_dimacs_csp(path, k):
+    adj, n, _ = read_dimacs(path)
+    csp = CSP(range(n), dict.fromkeys(range(n), range(k)))
+    csp.neighbors = adj
+    return csp
+
+# Writes adj (a dict or csp.neighbors) as a .col file, one line at a time
+def write_dimacs(path, adj, comment=None):
+    index = {v: i + 1 for i, v in enumerate(adj)}
+    edges = sum(len(nb) for nb in adj.values()) // 2
+    with open(path, "w") as f:
+        if comment:
+            f.write("c %s\n" % comment)
+        f.write("p edge %d %d\n" % (len(adj), edges))
+        for v, nb in adj.items():
+            i = index[v]
+            for u in nb:
+                if index[u] > i:
+                    f.write("e %d %d\n" % (i, index[u]))
+
+
+
+# Domains are int bitsets over csp.values (bit i stands for values[i]). Every pruning
+# goes through prune(), which logs (var, old_bits) on the trail, so search can take a
+# mark() before a choice and undo() back to it instead of collecting removals.
 class CSP:
-    def __init__(self, variables, domains, neighbors):
+    def __init__(self, variables, domains, neighbors=None):
         self.variables = list(variables)
-        self.domains = {v:set(domains[v]) for v in variables}
-        self.neighbors = {v:set(neighbors[v]) for v in variables}
+        values = {val for v in self.variables for val in domains[v]}
+        try:
+            self.values = sorted(values)
+        except TypeError:
+            self.values = list(values)
+        self.index = {val:i for i, val in enumerate(self.values)}
+        self.domains = {v:self.to_bits(domains[v]) for v in variables}
+        self.initial_domains = dict(self.domains)
+        if neighbors is None:
+            self.neighbors = {v:set() for v in self.variables}
+        else:
+            self.neighbors = {v:set(neighbors[v]) for v in self.variables}
+        self.trail = []
         self.nodes_explored = 0
 
+    # Incremental edits for graph colouring; pair them with repair_coloring to fix an
+    # existing colouring locally. Values of a new variable must already be in csp.values.
+    def add_variable(self, var, domain, neighbors=()):
+        self.variables.append(var)
+        self.domains[var] = self.initial_domains[var] = self.to_bits(domain)
+        self.neighbors[var] = set()
+        for nb in neighbors:
+            self.add_edge(var, nb)
+
+    def add_edge(self, u, v):
+        self.neighbors[u].add(v)
+        self.neighbors[v].add(u)
+
+    def remove_edge(self, u, v):
+        self.neighbors[u].discard(v)
+        self.neighbors[v].discard(u)
+
+    # values of var's domain as built (before any search pruning)
+    def initial_values(self, var):
+        bits = self.initial_domains[var]
+        return [val for i, val in enumerate(self.values) if bits >> i & 1]
+
+    def to_bits(self, vals):
+        bits = 0
+        for val in vals:
+            bits |= 1 << self.index[val]
+        return bits
+
+    def bit(self, val):
+        return 1 << self.index[val]
+
+    # values of var's domain in csp.values order
+    def domain_values(self, var):
+        bits = self.domains[var]
+        out = []
+        while bits:
+            low = bits & -bits
+            out.append(self.values[low.bit_length() - 1])
+            bits ^= low
+        return out
+
+    def prune(self, var, mask):
+        old = self.domains[var]
+        new = old & ~mask
+        if new != old:
+            self.trail.append((var, old))
+            self.domains[var] = new
+        return new
+
+    def mark(self):
+        return len(self.trail)
+
+    # restores every domain pruned since mark; returns the variables it touched
+    def undo(self, mark):
+        trail, domains = self.trail, self.domains
+        restored = []
+        while len(trail) > mark:
+            var, old = trail.pop()
+            domains[var] = old
+            restored.append(var)
+        return restored
+
 def is_consistent(var, val, assignment, csp):
     for nb in csp.neighbors[var]:
         if nb in assignment and assignment[nb]==val:
@@ -45,58 +317,508 @@ def select_unassigned_var(assignment, csp):
     unassigned = [v for v in csp.variables if v not in assignment]
     best=None; best_key=None
     for v in unassigned:
-        ds=len(csp.domains[v]); deg=len(csp.neighbors[v])
+        ds=csp.domains[v].bit_count(); deg=len(csp.neighbors[v])
         key=(ds, -deg)
         if best is None or key < best_key:
             best=v; best_key=key
     return best
 
+# MRV with degree tie-break over a lazy heap of (domain size, -degree, position, var).
+# A variable is pushed again whenever its domain changes or it is unassigned; entries
+# whose size no longer matches, or whose variable is assigned, are dropped on select.
+class VariableSelector:
+    def __init__(self, csp):
+        self.csp = csp
+        self.position = {v:i for i, v in enumerate(csp.variables)}
+        self.degree = {v:len(csp.neighbors[v]) for v in csp.variables}
+        self.heap = [(csp.domains[v].bit_count(), -self.degree[v], self.position[v], v) for v in csp.variables]
+        heapq.heapify(self.heap)
+
+    def push(self, var):
+        heapq.heappush(self.heap, (self.csp.domains[var].bit_count(), -self.degree[var], self.position[var], var))
+
+    # re-push everything pruned since mark
+    def changed_since(self, mark):
+        trail = self.csp.trail
+        for i in range(mark, len(trail)):
+            self.push(trail[i][0])
+
+    def select(self, assignment):
+        heap, domains = self.heap, self.csp.domains
+        while heap:
+            size, _, _, var = heapq.heappop(heap)
+            if var not in assignment and domains[var].bit_count() == size:
+                return var
+        return None
+
 def forward_check(var, val, csp, assignment):
-    removed=[]
+    bit = csp.bit(val)
     for nb in csp.neighbors[var]:
-        if nb not in assignment and val in csp.domains[nb]:
-            csp.domains[nb].remove(val)
-            removed.append((nb,val))
-            if len(csp.domains[nb])==0:
-                return False, removed
-    return True, removed
+        if nb not in assignment and csp.domains[nb] & bit:
+            if not csp.prune(nb, bit):
+                return False
+    return True
+
+# Arc xi -> xj of a "different colour" constraint: a value of xi loses its support
+# only when xj's domain is exactly that value.
+def revise(csp, xi, xj):
+    dj = csp.domains[xj]
+    if dj & (dj - 1) == 0 and csp.domains[xi] & dj:
+        csp.prune(xi, dj)
+        return True
+    return False
 
-def restore(csp, removed):
-    for v,val in removed:
-        csp.domains[v].add(val)
+def ac3(csp, queue=None):
+    if queue is None:
+        queue = deque((xi, xj) for xi in csp.variables for xj in csp.neighbors[xi])
+    while queue:
+        xi, xj = queue.popleft()
+        if revise(csp, xi, xj):
+            di = csp.domains[xi]
+            if di == 0:
+                return False
+            # arcs into xi can only lose support once xi is down to one value
+            if di & (di - 1) == 0:
+                for xk in csp.neighbors[xi]:
+                    if xk != xj:
+                        queue.append((xk, xi))
+    return True
 
+# Maintaining arc consistency: fix var's domain to val and propagate from its arcs
+def mac(var, val, csp, assignment):
+    csp.prune(var, csp.domains[var] & ~csp.bit(val))
+    return ac3(csp, deque((nb, var) for nb in csp.neighbors[var]))
 
-def backtracking_search(csp):
-    start=time.perf_counter()
-    assignment={}
-    csp.nodes_explored=0
-    tracemalloc.start()
-
-    def backtrack():
-        if len(assignment)==len(csp.variables):
-            return dict(assignment)
-        var = select_unassigned_var(assignment, csp)
-        csp.nodes_explored += 1
-        for val in sorted(list(csp.domains[var])):
-            if is_consistent(var, val, assignment, csp):
-                assignment[var]=val
-                ok, removed = forward_check(var, val, csp, assignment)
-                if ok:
-                    sol = backtrack()
-                    if sol is not None:
-                        return sol      
-                restore(csp, removed)
-                del assignment[var]
-        return None
 
-    sol = backtrack()
-    current, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
+# Explicit-stack backtracking, so search depth is bounded by memory rather than the
+# interpreter's recursion limit. Each frame is [var, untried values (reversed),
+# trail mark of the current value, current value, variables it pruned].
+# With backjumping=True forward checking records which assigned variables pruned
+# each domain; at a dead end the search jumps straight back to the deepest of them
+# (FC-CBJ) and passes the rest of the conflict set on to that variable.
+# run() stops cleanly on a node or time budget and can be called again to continue;
+# save_checkpoint()/from_checkpoint() persist a stopped search, which is rebuilt by
+# replaying the assignments on the stack. An rng shuffles the value order of each
+# new frame (variable ties follow csp.variables, so shuffle that for random ties);
+# prefer maps variables to a value to try first (e.g. from an earlier solution).
+class SearchEngine:
+    def __init__(self, csp, inference="mac", backjumping=False, rng=None, prefer=None):
+        if backjumping and inference != "fc":
+            raise ValueError("Conflict-directed backjumping needs inference='fc'")
+        self.csp = csp
+        self.inference = inference
+        self.backjumping = backjumping
+        self.rng = rng
+        self.prefer = prefer
+        self.initial = dict(csp.domains)
+        self.assignment = {}
+        self.frames = []
+        self.conf = {}
+        self.pruned_by = {v:[] for v in csp.variables}
+        self.selector = None
+        self.descend = True
+        self.status = "ready"
+        self.solution = None
+        csp.nodes_explored = 0
+
+    def _start(self):
+        csp = self.csp
+        self.selector = VariableSelector(csp)
+        if self.inference == "mac" and not ac3(csp):
+            self.status = "unsat"
+            return
+        self.selector.changed_since(0)
+        self.status = "running"
+
+    def _infer(self, frame, var, val):
+        csp = self.csp
+        if not self.backjumping:
+            if self.inference == "mac":
+                return mac(var, val, csp, self.assignment)
+            return forward_check(var, val, csp, self.assignment)
+        bit = csp.bit(val)
+        pruned = frame[4]
+        for nb in csp.neighbors[var]:
+            if nb not in self.assignment and csp.domains[nb] & bit:
+                pruned.append(nb)
+                self.pruned_by[nb].append(var)
+                if not csp.prune(nb, bit):
+                    self.conf[var].update(self.pruned_by[nb])
+                    self.conf[var].discard(var)
+                    return False
+        return True
+
+    def _assign(self, frame, val):
+        var = frame[0]
+        mark = self.csp.mark()
+        self.assignment[var] = val
+        if self._infer(frame, var, val):
+            self.selector.changed_since(mark)
+            frame[2], frame[3] = mark, val
+            return True
+        frame[2] = mark
+        self._retract(frame)
+        return False
+
+    def _retract(self, frame):
+        for changed in self.csp.undo(frame[2]):
+            self.selector.push(changed)
+        for nb in frame[4]:
+            self.pruned_by[nb].pop()
+        frame[4] = []
+        del self.assignment[frame[0]]
+        frame[2] = frame[3] = None
+
+    # tries the remaining values of the top frame; True once one propagates
+    def _next_value(self, frame):
+        var, values = frame[0], frame[1]
+        csp, assignment = self.csp, self.assignment
+        while values:
+            val = values.pop()
+            if not is_consistent(var, val, assignment, csp):
+                if self.backjumping:
+                    self.conf[var].update(nb for nb in csp.neighbors[var] if assignment.get(nb) == val)
+                continue
+            if self._assign(frame, val):
+                return True
+        return False
+
+    # pops the exhausted top frame and unwinds to the variable to retry next
+    def _dead_end(self):
+        frame = self.frames.pop()
+        var = frame[0]
+        self.selector.push(var)
+        if not self.backjumping:
+            return bool(self.frames)
+        culprits = self.conf.pop(var) | set(self.pruned_by[var])
+        if not culprits:
+            return False
+        while self.frames[-1][0] not in culprits:
+            skipped = self.frames.pop()
+            self._retract(skipped)
+            self.conf.pop(skipped[0], None)
+            self.selector.push(skipped[0])
+        target = self.frames[-1][0]
+        self.conf[target] |= culprits - {target}
+        return True
+
+    def run(self, max_nodes=None, time_limit=None):
+        if self.status == "ready":
+            self._start()
+        if self.status in ("solved", "unsat"):
+            return self.status
+        csp = self.csp
+        self.status = "running"
+        deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        while True:
+            if (max_nodes is not None and csp.nodes_explored >= max_nodes and self.descend) or \
+                    (deadline is not None and time.perf_counter() >= deadline):
+                self.status = "budget"
+                return self.status
+            if self.descend:
+                if len(self.assignment) == len(csp.variables):
+                    self.solution = dict(self.assignment)
+                    self.status = "solved"
+                    return self.status
+                var = self.selector.select(self.assignment)
+                csp.nodes_explored += 1
+                self.conf[var] = set()
+                values = csp.domain_values(var)[::-1]
+                if self.rng is not None:
+                    self.rng.shuffle(values)
+                if self.prefer is not None and self.prefer.get(var) in values:
+                    values.remove(self.prefer[var])
+                    values.append(self.prefer[var])
+                self.frames.append([var, values, None, None, []])
+            frame = self.frames[-1]
+            if frame[2] is not None:
+                self._retract(frame)
+            self.descend = self._next_value(frame)
+            if not self.descend and not self._dead_end():
+                self.status = "unsat"
+                return self.status
+
+    def save_checkpoint(self, path):
+        state = {
+            "values": self.csp.values, "initial": self.initial,
+            "inference": self.inference, "backjumping": self.backjumping, "rng": self.rng,
+            "prefer": self.prefer,
+            "frames": [(f[0], list(f[1]), f[3]) for f in self.frames],
+            "conf": self.conf, "descend": self.descend,
+            "status": self.status, "solution": self.solution, "nodes": self.csp.nodes_explored,
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(state, f)
+        os.replace(tmp, path)
+
+    # csp must describe the same problem the checkpoint was taken from
+    @classmethod
+    def from_checkpoint(cls, csp, path):
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if state["values"] != csp.values or set(state["initial"]) != set(csp.variables):
+            raise ValueError("Checkpoint %s does not match this CSP" % path)
+        csp.domains = dict(state["initial"])
+        csp.trail = []
+        engine = cls(csp, state["inference"], state["backjumping"], state["rng"], state["prefer"])
+        engine.status, engine.solution = state["status"], state["solution"]
+        if engine.status in ("solved", "unsat"):
+            return engine
+        engine._start()
+        for var, values, val in state["frames"]:
+            frame = [var, values, None, None, []]
+            engine.frames.append(frame)
+            engine.conf[var] = set()
+            if val is not None and not engine._assign(frame, val):
+                raise ValueError("Checkpoint %s does not replay on this CSP" % path)
+        engine.conf.update(state["conf"])
+        engine.descend = state["descend"]
+        engine.status = state["status"]
+        csp.nodes_explored = state["nodes"]
+        return engine
+
+
+# status is "solved", "unsat" or "budget" (max_nodes / time_limit ran out).
+# trace_memory starts tracemalloc for the search when nothing is tracing yet; its
+# overhead is large, so timed runs pass False. memory_peak_kb is None when untraced.
+def backtracking_search(csp, inference="mac", backjumping=False, max_nodes=None, time_limit=None,
+                        trace_memory=True):
+    start=time.perf_counter()
+    # leave an outer tracemalloc session (e.g. a benchmark's) running
+    tracing = tracemalloc.is_tracing()
+    if trace_memory and not tracing:
+        tracemalloc.start()
+    engine = SearchEngine(csp, inference, backjumping)
+    status = engine.run(max_nodes, time_limit)
+    peak = tracemalloc.get_traced_memory()[1] / 1024.0 if tracemalloc.is_tracing() else None
+    if trace_memory and not tracing:
+        tracemalloc.stop()
     return {
-        "solution": sol,
+        "solution": engine.solution,
         "time": time.perf_counter()-start,
-        "memory_peak_kb": peak/1024.0,
+        "memory_peak_kb": peak,
         "nodes_explored": csp.nodes_explored,
+        "status": status,
+    }
+
+# Greedy DSATUR: colour the vertex with the most distinct neighbour colours next
+# (ties by degree) with its smallest free colour. Uses as many colours as it needs,
+# so len(set(result.values())) is an upper bound on the chromatic number.
+def dsatur(adj):
+    position = {v:i for i, v in enumerate(adj)}
+    degree = {v:len(adj[v]) for v in adj}
+    seen = {v:set() for v in adj}
+    coloring = {}
+    heap = [(0, -degree[v], position[v], v) for v in adj]
+    heapq.heapify(heap)
+    while heap:
+        sat, _, _, v = heapq.heappop(heap)
+        if v in coloring or -sat != len(seen[v]):
+            continue
+        used = seen[v]
+        c = 0
+        while c in used:
+            c += 1
+        coloring[v] = c
+        for u in adj[v]:
+            if u not in coloring and c not in seen[u]:
+                seen[u].add(c)
+                heapq.heappush(heap, (-len(seen[u]), -degree[u], position[u], u))
+    return coloring
+
+# Luby restart sequence 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ... (i from 1)
+def luby(i):
+    while True:
+        k = i.bit_length()
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+# Randomized k-colouring search restarted with node budgets base * luby(i); every
+# restart shuffles the variable tie-break order and the value order
+def restart_search(adj, k, seed=0, base=100, inference="mac", backjumping=False, time_limit=None):
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+    nodes = 0
+    i = 0
+    while True:
+        i += 1
+        remaining = deadline - time.perf_counter() if deadline is not None else None
+        if remaining is not None and remaining <= 0:
+            return None, "budget", nodes
+        variables = list(adj)
+        rng.shuffle(variables)
+        csp = CSP(variables, {v:range(k) for v in adj}, adj)
+        engine = SearchEngine(csp, inference, backjumping, rng)
+        status = engine.run(base * luby(i), remaining)
+        nodes += csp.nodes_explored
+        if status != "budget" or remaining is not None and time.perf_counter() >= deadline:
+            return engine.solution, status, nodes
+
+def default_strategies():
+    return [
+        {"name": "dsatur", "method": "dsatur"},
+        {"name": "mac", "method": "search", "inference": "mac"},
+        {"name": "fc_cbj", "method": "search", "inference": "fc", "backjumping": True},
+        {"name": "luby_mac_s1", "method": "restarts", "inference": "mac", "seed": 1},
+        {"name": "luby_mac_s2", "method": "restarts", "inference": "mac", "seed": 2},
+        {"name": "luby_fc_cbj_s3", "method": "restarts", "inference": "fc", "backjumping": True, "seed": 3},
+    ]
+
+def run_strategy(task):
+    adj, k, strategy, time_limit = task
+    start = time.perf_counter()
+    method = strategy["method"]
+    if method == "dsatur":
+        coloring = dsatur(adj)
+        ok = len(set(coloring.values())) <= k
+        return strategy["name"], ("solved" if ok else "bound"), (coloring if ok else None), 0, time.perf_counter() - start
+    inference = strategy.get("inference", "mac")
+    backjumping = strategy.get("backjumping", False)
+    if method == "restarts":
+        solution, status, nodes = restart_search(adj, k, strategy.get("seed", 0), strategy.get("base", 100),
+                                                 inference, backjumping, time_limit)
+    else:
+        csp = CSP(list(adj), {v:range(k) for v in adj}, adj)
+        engine = SearchEngine(csp, inference, backjumping)
+        status = engine.run(time_limit=time_limit)
+        solution, nodes = engine.solution, csp.nodes_explored
+    return strategy["name"], status, solution, nodes, time.perf_counter() - start
+
+# Runs the strategies side by side on a process pool. The first one to find a
+# colouring (or prove that none with k colours exists) wins and the pool is torn
+# down with the others still running.
+def portfolio_coloring(adj, k=5, strategies=None, processes=None, time_limit=None):
+    strategies = strategies or default_strategies()
+    start = time.perf_counter()
+    tasks = [(adj, k, strategy, time_limit) for strategy in strategies]
+    result = {"solution": None, "strategy": None, "status": "budget", "nodes_explored": None, "runs": {}}
+    with mp.Pool(processes or len(tasks)) as pool:
+        for name, status, solution, nodes, elapsed in pool.imap_unordered(run_strategy, tasks):
+            result["runs"][name] = {"status": status, "nodes_explored": nodes, "time": elapsed}
+            if status in ("solved", "unsat"):
+                result.update(solution=solution, strategy=name, status=status, nodes_explored=nodes)
+                break
+    result["time"] = time.perf_counter() - start
+    return result
+
+# Min-conflicts repair of a colouring in place, starting from the vertices in start:
+# a random conflicted vertex takes the allowed colour fewest neighbours use (random
+# among ties, or any colour with probability noise). Returns (ok, steps).
+def min_conflicts_coloring(neighbors, coloring, colors_of, start, max_steps=10000, rng=None, noise=0.1):
+    rng = rng or random.Random()
+    conflicted = []
+    in_set = set()
+    for v in start:
+        if v not in in_set and any(coloring[u] == coloring[v] for u in neighbors[v]):
+            in_set.add(v)
+            conflicted.append(v)
+    steps = 0
+    while conflicted and steps < max_steps:
+        i = rng.randrange(len(conflicted))
+        v = conflicted[i]
+        conflicted[i] = conflicted[-1]
+        conflicted.pop()
+        in_set.discard(v)
+        counts = {}
+        for u in neighbors[v]:
+            c = coloring[u]
+            counts[c] = counts.get(c, 0) + 1
+        if not counts.get(coloring[v]):
+            continue
+        steps += 1
+        colors = colors_of(v)
+        if rng.random() < noise:
+            new = rng.choice(colors)
+        else:
+            best = min(counts.get(c, 0) for c in colors)
+            new = rng.choice([c for c in colors if counts.get(c, 0) == best])
+        coloring[v] = new
+        for u in neighbors[v]:
+            if coloring[u] == new and u not in in_set:
+                in_set.add(u)
+                conflicted.append(u)
+        if counts.get(new) and v not in in_set:
+            in_set.add(v)
+            conflicted.append(v)
+    return not conflicted, steps
+
+# Fixes coloring after add_edge/remove_edge/add_variable, touching only the
+# neighbourhood of the changed vertices; new vertices without a colour get the
+# least-conflicting one first.
+def repair_coloring(csp, coloring, changed, max_steps=10000, seed=None):
+    rng = random.Random(seed)
+    for v in changed:
+        if v not in coloring:
+            used = {coloring[u] for u in csp.neighbors[v] if u in coloring}
+            values = csp.initial_values(v)
+            coloring[v] = next((c for c in values if c not in used), values[0])
+    return min_conflicts_coloring(csp.neighbors, coloring, csp.initial_values, changed, max_steps, rng)
+
+# Clique lower bound: grow a clique greedily from each of the highest-degree vertices
+def greedy_clique(adj, tries=50):
+    best = []
+    for v in heapq.nlargest(tries, adj, key=lambda u: len(adj[u])):
+        clique = [v]
+        candidates = set(adj[v])
+        while candidates:
+            u = max(candidates, key=lambda w: len(adj[w]))
+            clique.append(u)
+            candidates &= adj[u]
+        if len(clique) > len(best):
+            best = clique
+    return best
+
+# Smallest k found by descending from the DSATUR bound. Each k-1 attempt starts from
+# the k-colouring: vertices of the dropped colour move to their least-conflicting
+# colour and min-conflicts repairs the rest (up to `repairs` tries from that same
+# start); only if all fail does an exact search run (trying each vertex's previous
+# colour first), which may also prove k-1 impossible. Stops at the clique lower bound.
+def minimize_colors(adj, seed=0, repairs=3, repair_steps=None, exact_nodes=100000, time_limit=None):
+    start = time.perf_counter()
+    deadline = start + time_limit if time_limit is not None else None
+    rng = random.Random(seed)
+    best = dsatur(adj)
+    upper = k = max(best.values()) + 1 if best else 0
+    lower = len(greedy_clique(adj)) if adj else 0
+    if repair_steps is None:
+        repair_steps = 20 * len(adj) + 1000
+    history = [(k, "dsatur", time.perf_counter() - start)]
+    proven = k == lower
+    while k > lower:
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        target = k - 1
+        moved = [v for v in best if best[v] >= target]
+        colors = list(range(target))
+        ok = False  # repairs=0 goes straight to the exact search
+        for _ in range(repairs):
+            trial = dict(best)
+            for v in moved:
+                used = [trial[u] for u in adj[v]]
+                trial[v] = min(colors, key=used.count)
+            ok, _ = min_conflicts_coloring(adj, trial, lambda v: colors, moved, repair_steps, rng)
+            if ok:
+                break
+        method = "min_conflicts"
+        if not ok:
+            csp = CSP(list(adj), {v:colors for v in adj}, adj)
+            engine = SearchEngine(csp, prefer=best)
+            remaining = deadline - time.perf_counter() if deadline is not None else None
+            status = engine.run(exact_nodes, remaining)
+            if status == "unsat":
+                proven = True
+                break
+            if status != "solved":
+                break
+            trial, method = engine.solution, "search"
+        best, k = trial, target
+        history.append((k, method, time.perf_counter() - start))
+        proven = k == lower
+    return {
+        "coloring": best, "colors": k, "lower_bound": lower, "upper_bound": upper,
+        "optimal": proven, "history": history, "time": time.perf_counter() - start,
     }
 
 def validate_coloring(adj, coloring):
@@ -108,25 +830,61 @@ def validate_coloring(adj, coloring):
     return True
 
 
-sizes = [100]   
-results=[]
-
-for n in sizes:
-    adj, nodes, edges = planar_graph(n)
-    domains = {v:set(range(5)) for v in adj}  
-    csp = CSP(list(adj.keys()), domains, adj)
-    res = backtracking_search(csp)
-    sol = res["solution"]
-    print(sol)
-    success = validate_coloring(adj, sol)
-    colors_used = len(set(sol.values())) if sol else None
-    results.append({
-        "n": n, "nodes": nodes, "edges": edges, "colors_used": colors_used,
-        "time_s": round(res["time"],4), "memory_peak_kb": round(res["memory_peak_kb"],2),
-        "nodes_explored": res["nodes_explored"],
-        "success": success
-    })
-
-df = pd.DataFrame(results)
-print(df.to_string(index=False))
+# Scaling sweep: family -> (generator(n, seed=...) of about n vertices, colours offered;
+# None means the DSATUR count, since chorded rings and random geometric graphs have no
+# known chromatic number). The grid is the same for every seed.
+GRAPH_FAMILIES = {
+    "ring": (ring_graph, None),
+    "planar": (triangulated_planar_graph, 4),
+    "grid": (lambda n, seed=0: grid_graph(math.isqrt(n), diagonals=True), 3),
+    "geometric": (random_geometric_graph, None),
+}
+
+if __name__ == "__main__":
+    # python csp.py [scaling_csv]
+    out_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                                 "csp_scaling.csv")
+    sizes = [100, 1000, 10000, 100000]
+    results=[]
+
+    for family, (generate, k) in GRAPH_FAMILIES.items():
+        for n in sizes:
+            adj, nodes, edges = generate(n)
+            colors = k if k is not None else max(dsatur(adj).values()) + 1
+            domains = {v:range(colors) for v in adj}
+            csp = CSP(list(adj.keys()), domains, adj)
+            res = backtracking_search(csp, time_limit=300)
+            sol = res["solution"]
+            success = validate_coloring(adj, sol)
+            colors_used = len(set(sol.values())) if sol else None
+            results.append({
+                "family": family, "n": n, "nodes": nodes, "edges": edges, "k": colors, "colors_used": colors_used,
+                "time_s": round(res["time"],4), "memory_peak_kb": round(res["memory_peak_kb"],2),
+                "nodes_explored": res["nodes_explored"], "status": res["status"],
+                "success": success
+            })
+
+    df = pd.DataFrame(results)
+    print(df.to_string(index=False))
+    df.to_csv(out_path, index=False)
+
+    adj, nodes, edges = planar_graph(1000)
+    res = portfolio_coloring(adj, k=4, time_limit=60)
+    print(f"\nPortfolio 4-colouring of {nodes} nodes: {res['status']} by {res['strategy']} "
+          f"in {res['time']:.3f}s, valid={validate_coloring(adj, res['solution'])}")
+
+    res = minimize_colors(adj, time_limit=60)
+    print(f"Minimum colours: {res['colors']} (clique bound {res['lower_bound']}, DSATUR {res['upper_bound']}, "
+          f"optimal={res['optimal']}), valid={validate_coloring(adj, res['coloring'])}")
 
+    csp = CSP(list(adj.keys()), {v:set(range(res['colors'])) for v in adj}, adj)
+    coloring = dict(res['coloring'])
+    rng = random.Random(0)
+    repaired = []
+    for _ in range(20):
+        u, v = rng.sample(range(nodes), 2)
+        csp.add_edge(u, v)
+        ok, steps = repair_coloring(csp, coloring, [u, v], seed=0)
+        repaired.append(ok)
+    print(f"After 20 edge insertions: repaired={all(repaired)} ({repaired.count(False)} failed), "
+          f"valid={validate_coloring(csp.neighbors, coloring)}")
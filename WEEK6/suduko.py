@@ -1,20 +1,25 @@
+import math
 import time
 import random
 import pandas as pd
 import tracemalloc
 from copy import deepcopy
 
+# Boards are n x n lists with n = box * box (4, 9, 16, 25, ...) and 0 for empty
 def print_board(bo):
-    for i in range(len(bo)):
-        if i % 3 == 0 and i != 0:
-            print("- - - - - - - - - - - -")
-        for j in range(len(bo[0])):
-            if j % 3 == 0 and j != 0:
+    n = len(bo)
+    box = math.isqrt(n)
+    width = len(str(n))
+    for i in range(n):
+        if i % box == 0 and i != 0:
+            print(" ".join(["-"] * (((width + 1) * n + 3 * (box - 1)) // 2)))
+        for j in range(n):
+            if j % box == 0 and j != 0:
                 print(" | ", end="")
-            if j == 8:
-                print(bo[i][j])
+            if j == n - 1:
+                print(str(bo[i][j]).rjust(width))
             else:
-                print(str(bo[i][j]) + " ", end="")
+                print(str(bo[i][j]).rjust(width) + " ", end="")
 
 
 def find_empty(bo):
@@ -34,16 +39,19 @@ def is_valid(bo, num, pos):
         if bo[i][pos[1]] == num and pos[0] != i:
             return False
 
-    box_x = pos[1] // 3
-    box_y = pos[0] // 3
-    for i in range(box_y * 3, box_y * 3 + 3):
-        for j in range(box_x * 3, box_x * 3 + 3):
+    box = math.isqrt(len(bo))
+    box_x = pos[1] // box
+    box_y = pos[0] // box
+    for i in range(box_y * box, box_y * box + box):
+        for j in range(box_x * box, box_x * box + box):
             if bo[i][j] == num and (i, j) != pos:
                 return False
     return True
 
-def generate_sudoku(difficulty):
-    base_board = [[0 for _ in range(9)] for _ in range(9)]
+# With unique=True a cell is only emptied if the puzzle keeps a single solution, so
+# fewer than `difficulty` cells may end up empty
+def generate_sudoku(difficulty, n=9, unique=False):
+    base_board = [[0 for _ in range(n)] for _ in range(n)]
     
     def fill_board(bo):
         find = find_empty(bo)
@@ -51,7 +59,7 @@ def generate_sudoku(difficulty):
             return True
         
         row, col = find
-        numbers = list(range(1, 10))
+        numbers = list(range(1, n + 1))
         random.shuffle(numbers)
 
         for num in numbers:
@@ -62,13 +70,28 @@ def generate_sudoku(difficulty):
                 bo[row][col] = 0
         return False
         
-    fill_board(base_board)
-    cells = [(r, c) for r in range(9) for c in range(9)]
+    if n == 9:
+        fill_board(base_board)
+    else:
+        # backtracking fills stall on larger boards; a shuffled exact cover does not
+        solve_dlx(base_board, rng=random)
+    cells = [(r, c) for r in range(n) for c in range(n)]
     random.shuffle(cells)
     
-    for r, c in cells[:difficulty]:
-        base_board[r][c] = 0
-        
+    if not unique:
+        for r, c in cells[:difficulty]:
+            base_board[r][c] = 0
+        return base_board
+
+    removed = 0
+    for r, c in cells:
+        if removed == difficulty:
+            break
+        value, base_board[r][c] = base_board[r][c], 0
+        if count_solutions(base_board, 2) == 1:
+            removed += 1
+        else:
+            base_board[r][c] = value
     return base_board
 
 def solve_simple_backtracking(bo):
@@ -78,7 +101,7 @@ def solve_simple_backtracking(bo):
     else:
         row, col = find
 
-    for i in range(1, 10):
+    for i in range(1, len(bo) + 1):
         if is_valid(bo, i, (row, col)):
             bo[row][col] = i
             if solve_simple_backtracking(bo):
@@ -89,8 +112,8 @@ def solve_simple_backtracking(bo):
 def solve_mrv(bo):
     min_r = min_c = None
     min_options = None
-    for r in range(9):
-        for c in range(9):
+    for r in range(len(bo)):
+        for c in range(len(bo)):
             if bo[r][c] == 0:
                 opts = candidates(bo, r, c)
                 if min_options is None or len(opts) < len(min_options):
@@ -112,16 +135,356 @@ def solve_mrv(bo):
     return False
 
 def candidates(bo, r, c):
-    opts = set(range(1,10))
+    n = len(bo)
+    box = math.isqrt(n)
+    opts = set(range(1,n+1))
     opts -= set(bo[r])
-    opts -= {bo[i][c] for i in range(9)}
-    sr, sc = (r//3)*3, (c//3)*3
-    for i in range(sr, sr+3):
-        for j in range(sc, sc+3):
+    opts -= {bo[i][c] for i in range(n)}
+    sr, sc = (r//box)*box, (c//box)*box
+    for i in range(sr, sr+box):
+        for j in range(sc, sc+box):
             opts.discard(bo[i][j])
     return opts
 
 
+# Constraint-propagation engine. Digits used in each row, column and box are kept
+# as n-bit masks (bit d-1 for digit d), so a cell's candidates are one and-not of
+# three ints. Empty cells sit in buckets by candidate count, giving the MRV cell
+# without a scan. Naked singles (bucket 1) and hidden singles (a digit with one
+# place left in a unit) are placed until neither applies; every placement goes on
+# a trail and a failed branch undoes back to its mark.
+_GEOMETRY = {}
+
+def _geometry(n):
+    if n not in _GEOMETRY:
+        box = math.isqrt(n)
+        where = [(i // n, i % n, (i // n) // box * box + (i % n) // box) for i in range(n * n)]
+        rows = [[r * n + c for c in range(n)] for r in range(n)]
+        cols = [[r * n + c for r in range(n)] for c in range(n)]
+        boxes = [[] for _ in range(n)]
+        for i, (_, _, b) in enumerate(where):
+            boxes[b].append(i)
+        peers = [sorted((set(rows[r]) | set(cols[c]) | set(boxes[b])) - {i})
+                 for i, (r, c, b) in enumerate(where)]
+        _GEOMETRY[n] = where, (rows, cols, boxes), peers
+    return _GEOMETRY[n]
+
+class BitmaskSudoku:
+    def __init__(self, bo):
+        n = self.n = len(bo)
+        self.full = (1 << n) - 1
+        self.where, unit_cells, self.peers = _geometry(n)
+        self.cells = [v for row in bo for v in row]
+        self.rows, self.cols, self.boxes = [0] * n, [0] * n, [0] * n
+        self.units = [(masks, k, cells) for masks, group in zip((self.rows, self.cols, self.boxes), unit_cells)
+                      for k, cells in enumerate(group)]
+        self.valid = True
+        for i, d in enumerate(self.cells):
+            if d:
+                r, c, b = self.where[i]
+                bit = 1 << (d - 1)
+                if (self.rows[r] | self.cols[c] | self.boxes[b]) & bit:
+                    self.valid = False
+                self.rows[r] |= bit
+                self.cols[c] |= bit
+                self.boxes[b] |= bit
+        self.count = [0] * (n * n)
+        self.buckets = [set() for _ in range(n + 1)]
+        for i, d in enumerate(self.cells):
+            if not d:
+                self.count[i] = self.candidates(i).bit_count()
+                self.buckets[self.count[i]].add(i)
+        self.trail = []
+
+    def candidates(self, i):
+        r, c, b = self.where[i]
+        return self.full & ~(self.rows[r] | self.cols[c] | self.boxes[b])
+
+    def _recount(self, i):
+        k = self.candidates(i).bit_count()
+        if k != self.count[i]:
+            self.buckets[self.count[i]].discard(i)
+            self.buckets[k].add(i)
+            self.count[i] = k
+
+    def place(self, i, d):
+        r, c, b = self.where[i]
+        bit = 1 << (d - 1)
+        self.cells[i] = d
+        self.rows[r] |= bit
+        self.cols[c] |= bit
+        self.boxes[b] |= bit
+        self.buckets[self.count[i]].discard(i)
+        self.trail.append(i)
+        for p in self.peers[i]:
+            if not self.cells[p]:
+                self._recount(p)
+
+    def undo(self, mark):
+        while len(self.trail) > mark:
+            i = self.trail.pop()
+            r, c, b = self.where[i]
+            bit = ~(1 << (self.cells[i] - 1))
+            self.cells[i] = 0
+            self.rows[r] &= bit
+            self.cols[c] &= bit
+            self.boxes[b] &= bit
+            for p in self.peers[i]:
+                if not self.cells[p]:
+                    self._recount(p)
+            self.count[i] = self.candidates(i).bit_count()
+            self.buckets[self.count[i]].add(i)
+
+    # (cell, digit) pairs forced in the first unit that has any, [] if none, or None
+    # if some unit has a digit with no place left
+    def hidden_singles(self):
+        for masks, k, cells in self.units:
+            once = twice = 0
+            for i in cells:
+                if not self.cells[i]:
+                    m = self.candidates(i)
+                    twice |= once & m
+                    once |= m
+            if (once | masks[k]) != self.full:
+                return None
+            single = once & ~twice
+            if single:
+                return [(i, (self.candidates(i) & single).bit_length()) for i in cells
+                        if not self.cells[i] and self.candidates(i) & single]
+        return []
+
+    def propagate(self):
+        while True:
+            if self.buckets[0]:
+                return False
+            if self.buckets[1]:
+                i = next(iter(self.buckets[1]))
+                self.place(i, self.candidates(i).bit_length())
+                continue
+            forced = self.hidden_singles()
+            if forced is None:
+                return False
+            if not forced:
+                return True
+            for i, d in forced:
+                # a cell that is the last place for two digits, or lost this one
+                if self.cells[i] or not self.candidates(i) >> (d - 1) & 1:
+                    return False
+                self.place(i, d)
+
+    def select(self):
+        for bucket in self.buckets[2:]:
+            if bucket:
+                return next(iter(bucket))
+        return None
+
+    def solve(self):
+        if not self.valid:
+            return False
+        mark = len(self.trail)
+        if self.propagate():
+            i = self.select()
+            if i is None:
+                return True
+            m = self.candidates(i)
+            while m:
+                bit = m & -m
+                m ^= bit
+                branch = len(self.trail)
+                self.place(i, bit.bit_length())
+                if self.solve():
+                    return True
+                self.undo(branch)
+        self.undo(mark)
+        return False
+
+    def board(self):
+        n = self.n
+        return [self.cells[r * n:(r + 1) * n] for r in range(n)]
+
+# Same contract as the other solvers: fills bo in place, returns whether it solved
+def solve_bitmask(bo):
+    engine = BitmaskSudoku(bo)
+    if not engine.solve():
+        return False
+    for row, solved in zip(bo, engine.board()):
+        row[:] = solved
+    return True
+
+
+# Exact cover with Dancing Links (Knuth's Algorithm X). Nodes live in flat int
+# lists (left, right, up, down, column) rather than objects: index 0 is the root,
+# 1..ncols the column headers, then four nodes per candidate row. The search is
+# iterative, keeping the chosen node of each level on a stack.
+class DancingLinks:
+    def __init__(self, ncols, rows):
+        self.L = [ncols] + list(range(ncols))
+        self.R = list(range(1, ncols + 1)) + [0]
+        self.U = list(range(ncols + 1))
+        self.D = list(range(ncols + 1))
+        self.C = list(range(ncols + 1))
+        self.S = [0] * (ncols + 1)
+        self.row_of = [-1] * (ncols + 1)
+        for r, cols in enumerate(rows):
+            first = len(self.C)
+            for k, col in enumerate(cols):
+                node = first + k
+                col += 1
+                self.L.append(node - 1 if k else first + len(cols) - 1)
+                self.R.append(node + 1 if k < len(cols) - 1 else first)
+                self.U.append(self.U[col])
+                self.D.append(col)
+                self.D[self.U[col]] = node
+                self.U[col] = node
+                self.C.append(col)
+                self.row_of.append(r)
+                self.S[col] += 1
+
+    def cover(self, c):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        L[R[c]] = L[c]
+        R[L[c]] = R[c]
+        i = D[c]
+        while i != c:
+            j = R[i]
+            while j != i:
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def uncover(self, c):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[c]
+        while i != c:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            i = U[i]
+        L[R[c]] = c
+        R[L[c]] = c
+
+    def _choose(self):
+        R, S = self.R, self.S
+        best, size = None, None
+        c = R[0]
+        while c:
+            if size is None or S[c] < size:
+                best, size = c, S[c]
+                if size <= 1:
+                    break
+            c = R[c]
+        return best
+
+    def _enter(self, node):
+        j = self.R[node]
+        while j != node:
+            self.cover(self.C[j])
+            j = self.R[j]
+
+    def _leave(self, node):
+        j = self.L[node]
+        while j != node:
+            self.uncover(self.C[j])
+            j = self.L[j]
+
+    # Returns (count, rows of the first solution); stops once `limit` are found
+    def search(self, limit=1):
+        count, first = 0, None
+        stack = []
+        descend = True
+        while True:
+            if descend:
+                c = self._choose()
+                if c is None:
+                    count += 1
+                    if first is None:
+                        first = [self.row_of[node] for node in stack]
+                    if count >= limit:
+                        break
+                elif self.S[c]:
+                    self.cover(c)
+                    stack.append(self.D[c])
+                    self._enter(stack[-1])
+                    continue
+            # backtrack: move the deepest choice down its column, popping exhausted levels
+            while stack:
+                node = stack.pop()
+                self._leave(node)
+                node = self.D[node]
+                if node != self.C[node]:
+                    stack.append(node)
+                    self._enter(node)
+                    break
+                self.uncover(node)
+            else:
+                break
+            descend = True
+        return count, first
+
+# Sudoku as exact cover: candidate (r, c, d) covers cell (r, c), digit d in row r,
+# in column c and in its box. Givens are placed up front, so only the columns they
+# leave open and the candidates compatible with them enter the matrix. Returns
+# (DancingLinks, candidates), or None if two givens clash. With rng the candidate
+# order is shuffled (used to fill random boards).
+def sudoku_exact_cover(bo, rng=None):
+    n = len(bo)
+    box = math.isqrt(n)
+    def columns(r, c, d):
+        b = r // box * box + c // box
+        return (r * n + c, n * n + r * n + d, 2 * n * n + c * n + d, 3 * n * n + b * n + d)
+    used = set()
+    for r in range(n):
+        for c in range(n):
+            if bo[r][c]:
+                cols = columns(r, c, bo[r][c] - 1)
+                if used.intersection(cols):
+                    return None
+                used.update(cols)
+    free = [col for col in range(4 * n * n) if col not in used]
+    index = {col: i for i, col in enumerate(free)}
+    cands, rows = [], []
+    for r in range(n):
+        for c in range(n):
+            if bo[r][c]:
+                continue
+            for d in range(n):
+                cols = columns(r, c, d)
+                if not used.intersection(cols):
+                    cands.append((r, c, d + 1))
+                    rows.append([index[col] for col in cols])
+    if rng is not None:
+        order = list(range(len(rows)))
+        rng.shuffle(order)
+        cands = [cands[i] for i in order]
+        rows = [rows[i] for i in order]
+    return DancingLinks(len(free), rows), cands
+
+def solve_dlx(bo, rng=None):
+    problem = sudoku_exact_cover(bo, rng)
+    if problem is None:
+        return False
+    links, cands = problem
+    count, rows = links.search(1)
+    if not count:
+        return False
+    for i in rows:
+        r, c, d = cands[i]
+        bo[r][c] = d
+    return True
+
+# Number of solutions, counting stops at limit (2 answers "is it unique?")
+def count_solutions(bo, limit=2):
+    problem = sudoku_exact_cover(bo)
+    if problem is None:
+        return 0
+    return problem[0].search(limit)[0]
+
+
 def measure(func, bo):
     b = deepcopy(bo)
     tracemalloc.start()
@@ -138,39 +501,77 @@ def measure(func, bo):
     }
 
 
-difficulty = 60 
-puzzle_board = generate_sudoku(difficulty)
-
-print(f"Generated Sudoku Puzzle (Difficulty: {difficulty} empty cells)")
-print_board(puzzle_board)
-
-plain_result = measure(solve_simple_backtracking, puzzle_board)
-
-print("Plain solver solved?:", plain_result["solved"])
-if plain_result["solved"]:
-    print("Solution found by plain solver:\n")
-    print_board(plain_result["solution"])
-
-mrv_result = measure(solve_mrv, puzzle_board)
-print("MRV solver solved?:", mrv_result["solved"])
-if mrv_result["solved"]:
-    print("Solution found by MRV solver:\n")
-    print_board(mrv_result["solution"])
-
-df = pd.DataFrame([
-        {
-            "method": "Plain Backtracking",
-            "time_s": round(plain_result["time_s"], 6),
-            "peak_mem_kb": round(plain_result["peak_mem_kb"], 2),
-            "solved": plain_result["solved"]
-        },
-        {
-            "method": "MRV Heuristic",
-            "time_s": round(mrv_result["time_s"], 6),
-            "peak_mem_kb": round(mrv_result["peak_mem_kb"], 2),
-            "solved": mrv_result["solved"]
-        }
-    ])
-
-print("\nComparison table:\n")
-print(df.to_string(index=False))
\ No newline at end of file
+if __name__ == "__main__":
+    difficulty = 60 
+    puzzle_board = generate_sudoku(difficulty)
+
+    print(f"Generated Sudoku Puzzle (Difficulty: {difficulty} empty cells)")
+    print_board(puzzle_board)
+
+    plain_result = measure(solve_simple_backtracking, puzzle_board)
+
+    print("Plain solver solved?:", plain_result["solved"])
+    if plain_result["solved"]:
+        print("Solution found by plain solver:\n")
+        print_board(plain_result["solution"])
+
+    mrv_result = measure(solve_mrv, puzzle_board)
+    print("MRV solver solved?:", mrv_result["solved"])
+    if mrv_result["solved"]:
+        print("Solution found by MRV solver:\n")
+        print_board(mrv_result["solution"])
+
+    bitmask_result = measure(solve_bitmask, puzzle_board)
+    print("Bitmask solver solved?:", bitmask_result["solved"])
+    if bitmask_result["solved"]:
+        print("Solution found by bitmask solver:\n")
+        print_board(bitmask_result["solution"])
+
+    dlx_result = measure(solve_dlx, puzzle_board)
+    print("Dancing Links solver solved?:", dlx_result["solved"])
+    print("Puzzle has a unique solution?:", count_solutions(puzzle_board, 2) == 1)
+
+    df = pd.DataFrame([
+            {
+                "method": "Plain Backtracking",
+                "time_s": round(plain_result["time_s"], 6),
+                "peak_mem_kb": round(plain_result["peak_mem_kb"], 2),
+                "solved": plain_result["solved"]
+            },
+            {
+                "method": "MRV Heuristic",
+                "time_s": round(mrv_result["time_s"], 6),
+                "peak_mem_kb": round(mrv_result["peak_mem_kb"], 2),
+                "solved": mrv_result["solved"]
+            },
+            {
+                "method": "Bitmask Propagation",
+                "time_s": round(bitmask_result["time_s"], 6),
+                "peak_mem_kb": round(bitmask_result["peak_mem_kb"], 2),
+                "solved": bitmask_result["solved"]
+            },
+            {
+                "method": "Dancing Links",
+                "time_s": round(dlx_result["time_s"], 6),
+                "peak_mem_kb": round(dlx_result["peak_mem_kb"], 2),
+                "solved": dlx_result["solved"]
+            }
+        ])
+
+    print("\nComparison table:\n")
+    print(df.to_string(index=False))
+
+    big_board = generate_sudoku(150, n=16)
+    print("\n16x16 puzzle (150 empty cells):")
+    print_board(big_board)
+    rows = []
+    for method, func in (("Bitmask Propagation", solve_bitmask), ("Dancing Links", solve_dlx)):
+        result = measure(func, big_board)
+        rows.append({
+            "method": method,
+            "time_s": round(result["time_s"], 6),
+            "peak_mem_kb": round(result["peak_mem_kb"], 2),
+            "solved": result["solved"]
+        })
+    print("\n16x16 comparison table:\n")
+    print(pd.DataFrame(rows).to_string(index=False))
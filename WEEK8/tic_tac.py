@@ -194,13 +194,12 @@ def play_game(choice):
                         "Nodes Evaluated": alphabeta_nodes_evaluated})
 
 
-print("---MINMAX Algorithm---")
-play_game(1)
-print("---ALPHA-BETA Algorithm---")
-play_game(2)
-
-df = pd.DataFrame(results)
-
-print(df)
+if __name__ == "__main__":
+    print("---MINMAX Algorithm---")
+    play_game(1)
+    print("---ALPHA-BETA Algorithm---")
+    play_game(2)
 
+    df = pd.DataFrame(results)
 
+    print(df)
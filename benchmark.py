@@ -0,0 +1,292 @@
+import argparse
+import csv
+import importlib.util
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from copy import deepcopy
+
+# Benchmark harness shared by the weekly search modules.
+#
+# A benchmark is registered with a setup(size, seed) function that builds a seeded
+# instance and returns a zero-argument run() callable. Each call of run() is one
+# timed sample and returns the number of nodes it explored (or None).
+# Every (benchmark, size) pair gets warm-up runs, `repeats` timed runs and one
+# separate tracemalloc run for peak memory, so tracing never skews the timings.
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BENCHMARKS = {}
+FIELDS = ["suite", "benchmark", "size", "seed", "repeats", "median_s", "mean_s", "p95_s", "p99_s",
+          "min_s", "max_s", "nodes", "nodes_per_s", "peak_mem_kb"]
+
+def register(suite, name, sizes, setup):
+    BENCHMARKS[(suite, name)] = (list(sizes), setup)
+
+def benchmark(suite, name, sizes):
+    def wrap(setup):
+        register(suite, name, sizes, setup)
+        return setup
+    return wrap
+
+# Loads WEEKn/<file>.py under a unique module name (WEEK1 and WEEK3 both have eight_puz.py)
+def load_week(week, filename):
+    directory = os.path.join(ROOT, week)
+    name = "%s_%s" % (week.lower(), filename[:-3])
+    if name in sys.modules:
+        return sys.modules[name]
+    sys.path.insert(0, directory)
+    try:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(directory, filename))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(directory)
+    return module
+
+def percentile(sorted_values, q):
+    # nearest-rank percentile: the smallest value with at least q% of the values at or below it
+    idx = max(0, math.ceil(q / 100.0 * len(sorted_values)) - 1)
+    return sorted_values[idx]
+
+def measure(setup, size, seed, repeats, warmup):
+    run = setup(size, seed)
+    for _ in range(warmup):
+        run()
+
+    times = []
+    nodes = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        explored = run()
+        times.append(time.perf_counter() - t0)
+        if explored is not None:
+            nodes.append(explored)
+
+    # memory pass on a fresh instance; solvers that stop tracemalloc themselves report None
+    run = setup(size, seed)
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1] / 1024.0 if tracemalloc.is_tracing() else None
+    tracemalloc.stop()
+
+    times.sort()
+    median = statistics.median(times)
+    total_nodes = statistics.mean(nodes) if nodes else None
+    return {
+        "repeats": repeats,
+        "median_s": median,
+        "mean_s": statistics.mean(times),
+        "p95_s": percentile(times, 95),
+        "p99_s": percentile(times, 99),
+        "min_s": times[0],
+        "max_s": times[-1],
+        "nodes": total_nodes,
+        "nodes_per_s": total_nodes / median if total_nodes is not None and median > 0 else None,
+        "peak_mem_kb": peak,
+    }
+
+def run_benchmarks(suites=None, names=None, seed=0, repeats=20, warmup=3, sizes=None, verbose=True):
+    rows = []
+    for (suite, name), (default_sizes, setup) in sorted(BENCHMARKS.items()):
+        if suites and suite not in suites:
+            continue
+        if names and name not in names:
+            continue
+        for size in (sizes or default_sizes):
+            row = {"suite": suite, "benchmark": name, "size": size, "seed": seed}
+            row.update(measure(setup, size, seed, repeats, warmup))
+            rows.append(row)
+            if verbose:
+                print("%-8s %-28s %8s  median %.6fs  p95 %.6fs  p99 %.6fs" % (
+                    suite, name, size, row["median_s"], row["p95_s"], row["p99_s"]), flush=True)
+    return rows
+
+def write_csv(rows, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+
+def write_json(rows, path):
+    with open(path, "w") as f:
+        json.dump(rows, f, indent=1, sort_keys=True)
+
+# Median-time ratio new/old for every (suite, benchmark, size) present in both files
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = {(r["suite"], r["benchmark"], r["size"]): r for r in json.load(f)}
+    with open(new_path) as f:
+        new = {(r["suite"], r["benchmark"], r["size"]): r for r in json.load(f)}
+    report = []
+    for key in sorted(old.keys() & new.keys()):
+        ratio = new[key]["median_s"] / old[key]["median_s"] if old[key]["median_s"] else None
+        report.append((key, old[key]["median_s"], new[key]["median_s"], ratio))
+    return report
+
+
+# Built-in suites
+
+def _cycle(items):
+    state = {"i": 0}
+    def next_item():
+        item = items[state["i"] % len(items)]
+        state["i"] += 1
+        return item
+    return next_item
+
+def _register_graph_suite():
+    def graph_setup(algorithm):
+        def setup(size, seed):
+            comp = load_week("WEEK2", "comp.py")
+            graph = comp.generate_csr_graph(size, extra_edges_factor=2, weight_range=(1, 20), seed=seed)
+            rng = random.Random(seed)
+            next_pair = _cycle([tuple(rng.sample(range(size), 2)) for _ in range(32)])
+            search = getattr(comp, algorithm)
+            if algorithm in ("astar", "bidirectional_ucs"):
+                comp.build_landmarks(graph)
+            def run():
+                s, d = next_pair()
+                return search(graph, s, d)["nodes"]
+            return run
+        return setup
+
+    for algorithm in ("bfs", "ucs", "ids", "astar", "bidirectional_ucs"):
+        register("graph", algorithm, [1000, 10000, 100000], graph_setup(algorithm))
+
+def _register_puzzle_suite():
+    def puzzle_setup(solver):
+        def setup(size, seed):
+            puzzle = load_week("WEEK3", "eight_puz.py")
+            random.seed(seed)
+            goal = tuple(range(1, size * size)) + (0,)
+            if size == 3:
+                states = [puzzle.generate_random_state() for _ in range(16)]
+            else:
+                # random walks keep 15-puzzle instances in a range pure Python can solve
+                states = []
+                for _ in range(16):
+                    state = goal
+                    for _ in range(40):
+                        state = random.choice(puzzle.next_states(state))[0]
+                    states.append(state)
+            next_state = _cycle(states)
+            def run():
+                stats = []
+                if solver == "ida_star":
+                    puzzle.ida_star(next_state(), goal, puzzle.manhattan, stats)
+                    return sum(n for _, n in stats)
+                puzzle.a_star(next_state(), goal, puzzle.manhattan)
+                return None
+            return run
+        return setup
+
+    register("puzzle", "ida_star", [3, 4], puzzle_setup("ida_star"))
+    register("puzzle", "a_star", [3], puzzle_setup("a_star"))
+
+def _register_csp_suite():
+    def setup(size, seed):
+        csp_module = load_week("WEEK5", "csp.py")
+        adj, _, _ = csp_module.planar_graph(size)
+        # the lab graph itself is fixed; the seed orders the variables, which decides MRV ties
+        variables = list(adj)
+        random.Random(seed).shuffle(variables)
+        def run():
+            csp = csp_module.CSP(variables, {v: set(range(5)) for v in adj}, adj)
+            return csp_module.backtracking_search(csp, trace_memory=False)["nodes_explored"]
+        return run
+    register("csp", "backtracking_search", [100, 1000], setup)
+
+    # MAC search on each scaling family; pass --size up to 100000 for the full sweep
+    def family_setup(family):
+        def setup(size, seed):
+            csp_module = load_week("WEEK5", "csp.py")
+            generate, k = csp_module.GRAPH_FAMILIES[family]
+            adj, _, _ = generate(size, seed=seed)
+            if k is None:
+                k = max(csp_module.dsatur(adj).values()) + 1
+            def run():
+                csp = csp_module.CSP(list(adj.keys()), {v: range(k) for v in adj}, adj)
+                return csp_module.backtracking_search(csp, trace_memory=False)["nodes_explored"]
+            return run
+        return setup
+    for family in ("ring", "planar", "grid", "geometric"):
+        register("csp", "mac_" + family, [100, 1000, 10000], family_setup(family))
+
+def _register_sudoku_suite():
+    def sudoku_setup(solver):
+        def setup(size, seed):
+            sudoku = load_week("WEEK6", "suduko.py")
+            random.seed(seed)
+            puzzles = [sudoku.generate_sudoku(size) for _ in range(8)]
+            next_puzzle = _cycle(puzzles)
+            solve = getattr(sudoku, solver)
+            def run():
+                solve(deepcopy(next_puzzle()))
+                return None
+            return run
+        return setup
+    for solver in ("solve_simple_backtracking", "solve_mrv", "solve_bitmask", "solve_dlx"):
+        register("sudoku", solver, [40, 50, 60], sudoku_setup(solver))
+
+def _register_minimax_suite():
+    def minimax_setup(algorithm):
+        def setup(size, seed):
+            game = load_week("WEEK8", "tic_tac.py")
+            rng = random.Random(seed)
+            # `size` empty squares left on a board reached by random non-terminal play
+            boards = []
+            while len(boards) < 8:
+                board = [' '] * 9
+                player = game.PLAYER_HUMAN
+                for move in rng.sample(range(9), 9 - size):
+                    board[move] = player
+                    player = game.PLAYER_AI if player == game.PLAYER_HUMAN else game.PLAYER_HUMAN
+                if game.evaluate(board) == 0:
+                    boards.append(board)
+            next_board = _cycle(boards)
+            counter = "minimax_nodes_evaluated" if algorithm == "minimax" else "alphabeta_nodes_evaluated"
+            find = game.find_best_move_minimax if algorithm == "minimax" else game.find_best_move_alpha_beta
+            def run():
+                before = getattr(game, counter)
+                find(list(next_board()))
+                return getattr(game, counter) - before
+            return run
+        return setup
+    for algorithm in ("minimax", "alpha_beta"):
+        register("minimax", algorithm, [5, 7, 8], minimax_setup(algorithm))
+
+_register_graph_suite()
+_register_puzzle_suite()
+_register_csp_suite()
+_register_sudoku_suite()
+_register_minimax_suite()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the search benchmarks")
+    parser.add_argument("--suite", action="append", help="suite to run (repeatable), default all")
+    parser.add_argument("--benchmark", action="append", help="benchmark name to run (repeatable)")
+    parser.add_argument("--size", action="append", type=int, help="override the sizes of the selected benchmarks (repeatable)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--out", default="bench_results", help="output prefix for .csv and .json")
+    parser.add_argument("--compare", metavar="OLD_JSON", help="compare against an earlier run")
+    args = parser.parse_args()
+
+    rows = run_benchmarks(args.suite, args.benchmark, args.seed, args.repeats, args.warmup, args.size)
+    write_csv(rows, args.out + ".csv")
+    write_json(rows, args.out + ".json")
+    print("Wrote %s.csv and %s.json" % (args.out, args.out))
+
+    if args.compare:
+        print("\nMedian time new/old:")
+        for (suite, name, size), old_t, new_t, ratio in compare(args.compare, args.out + ".json"):
+            print("%-8s %-28s %8s  %.6fs -> %.6fs  x%.2f" % (suite, name, size, old_t, new_t, ratio or 0))
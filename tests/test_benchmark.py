@@ -0,0 +1,69 @@
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from benchmark import BENCHMARKS, FIELDS, load_week, percentile, run_benchmarks
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 21))
+    assert percentile(values, 50) == 10
+    assert percentile(values, 95) == 19
+    assert percentile(values, 99) == 20
+
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+
+
+def test_percentile_small_lists():
+    assert percentile([7], 0) == 7
+    assert percentile([7], 99) == 7
+    assert percentile([1, 2], 50) == 1
+    assert percentile([1, 2], 51) == 2
+
+
+def test_run_benchmarks_rows():
+    rows = run_benchmarks(suites=["csp"], names=["backtracking_search", "mac_geometric"],
+                          seed=3, repeats=2, warmup=0, sizes=[60], verbose=False)
+    assert [row["benchmark"] for row in rows] == ["backtracking_search", "mac_geometric"]
+    for row in rows:
+        assert set(row) == set(FIELDS)
+        assert row["suite"] == "csp" and row["size"] == 60 and row["seed"] == 3
+        assert row["repeats"] == 2
+        assert row["min_s"] <= row["median_s"] <= row["max_s"]
+        assert row["nodes"] == 60
+        assert row["peak_mem_kb"] > 0
+
+
+def test_csp_setup_uses_seed():
+    csp_module = load_week("WEEK5", "csp.py")
+    generate, _ = csp_module.GRAPH_FAMILIES["geometric"]
+    _, setup = BENCHMARKS[("csp", "mac_geometric")]
+    assert generate(200, seed=0)[0] != generate(200, seed=1)[0]
+    assert setup(200, 0)() == setup(200, 1)() == 200
+
+
+def test_backtracking_search_memory_tracing():
+    csp_module = load_week("WEEK5", "csp.py")
+    adj, _, _ = csp_module.planar_graph(40)
+    def search(**options):
+        csp = csp_module.CSP(list(adj), {v: range(4) for v in adj}, adj)
+        return csp_module.backtracking_search(csp, **options)
+
+    untraced = search(trace_memory=False)
+    assert untraced["status"] == "solved" and untraced["memory_peak_kb"] is None
+    assert not tracemalloc.is_tracing()
+    assert search()["memory_peak_kb"] > 0
+    assert not tracemalloc.is_tracing()
+
+    # an outer session (the harness's memory pass) is reported and left running
+    tracemalloc.start()
+    try:
+        assert search(trace_memory=False)["memory_peak_kb"] > 0
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()